@@ -1,6 +1,6 @@
 from typing import Any, Optional, Callable, Iterable
 import itertools
-import copy
+import functools
 from .definitions import (
     T, ScrSetupError, DocumentType, SeleniumVariant, selenium_variants_dict,
     selenium_strats_dict, selenium_download_strategies_dict, verbosities_dict,
@@ -192,9 +192,7 @@ def extend_match_chain_list(ctx: 'scr_context.ScrContext', needed_id: int) -> No
     if len(ctx.match_chains) > needed_id:
         return
     for i in range(len(ctx.match_chains), needed_id+1):
-        mc = copy.deepcopy(ctx.origin_mc)
-        mc.chain_id = i
-        ctx.match_chains.append(mc)
+        ctx.match_chains.append(ctx.origin_mc.clone(i))
 
 
 def parse_simple_mc_range(ctx: 'scr_context.ScrContext', mc_spec: str, arg: str) -> Iterable['match_chain.MatchChain']:
@@ -204,11 +202,11 @@ def parse_simple_mc_range(ctx: 'scr_context.ScrContext', mc_spec: str, arg: str)
         s = s.strip()
         if s == "":
             raise ScrSetupError(
-                "invalid empty range in match chain specification of '{arg}'")
+                f"invalid empty range in match chain specification of '{arg}'")
         dash_split = [r.strip() for r in s.split("-")]
         if len(dash_split) > 2 or s == "-":
             raise ScrSetupError(
-                "invalid range '{s}' in match chain specification of '{arg}'")
+                f"invalid range '{s}' in match chain specification of '{arg}'")
         if len(dash_split) == 1:
             id = parse_mc_range_int(ctx, dash_split[0], arg)
             extend_match_chain_list(ctx, id)
@@ -271,7 +269,10 @@ def parse_mc_range(ctx: 'scr_context.ScrContext', mc_spec: str, arg: str) -> Ite
         # hack: parse exclude again so the newly generated chains form include are respected
         if chain_count != len(ctx.match_chains):
             exclude = parse_simple_mc_range(ctx, rhs, arg)
-    return ({*include} - {*exclude})
+    # keep the order of include (and drop its duplicates) so
+    # the chains are visited deterministically
+    excluded = set(exclude)
+    return [mc for mc in dict.fromkeys(include) if mc not in excluded]
 
 
 def parse_mc_arg(
@@ -414,11 +415,13 @@ def parse_variant_arg(val: str, variants_dict: dict[str, T], arg: str, default:
     return res
 
 
+@functools.lru_cache(maxsize=128)
 def verify_encoding(encoding: str) -> bool:
     try:
         "!".encode(encoding=encoding)
         return True
-    except UnicodeEncodeError:
+    except (UnicodeEncodeError, LookupError):
+        # LookupError for unknown encodings and non text codecs like 'rot13'
         return False
 
 
@@ -539,6 +542,176 @@ def parse_selenium_variants(value: str, arg: str) -> Optional['SeleniumVariant']
     return parse_variant_arg(value, selenium_variants_dict, arg)
 
 
+ArgHandler = Callable[['scr_context.ScrContext', str, str], bool]
+
+
+def mc_arg(
+    config_opt_names: list[str],
+    value_parse: Callable[[str, str], Any] = lambda x, _arg: x,
+    support_blank: bool = False, blank_value: Optional[Any] = None
+) -> ArgHandler:
+    return lambda ctx, argname, arg: apply_mc_arg(
+        ctx, argname, config_opt_names, arg, value_parse, support_blank, blank_value
+    )
+
+
+def mc_range_arg(config_opt_names: list[str]) -> ArgHandler:
+    return lambda ctx, argname, arg: apply_mc_arg(
+        ctx, argname, config_opt_names, arg,
+        lambda v, arg: parse_mc_arg_as_range(ctx, arg, v)
+    )
+
+
+def doc_arg(doctype: DocumentType) -> ArgHandler:
+    return lambda ctx, argname, arg: apply_doc_arg(ctx, argname, doctype, arg)
+
+
+def doc_arg_stdin(doctype: DocumentType) -> ArgHandler:
+    return lambda ctx, argname, arg: apply_doc_arg_stdin(ctx, argname, arg, doctype)
+
+
+def ctx_arg(
+    config_opt_name: str,
+    value_parse: Callable[[str, str], Any] = lambda x, _arg: x,
+    support_blank: bool = False,
+    blank_val: Any = None
+) -> ArgHandler:
+    return lambda ctx, argname, arg: apply_ctx_arg(
+        ctx, argname, config_opt_name, arg, value_parse, support_blank, blank_val
+    )
+
+
+# we need a "infinite" int value default fox cxs/lxs/dxs
+INT_MAX = 2**64 - 1
+
+# every argument name is the leading run of lowercase letters of the argument,
+# (potentially prefixed by '--'), so we can dispatch with a single lookup
+# instead of testing each option in turn
+ARG_NAME_REGEX = re.compile("^(?:--)?[a-z]*")
+
+ARG_HANDLERS: dict[str, ArgHandler] = {
+    # content args
+    "cx": mc_arg(["loc_content", "xpath"]),
+    "cr": mc_arg(["loc_content", "regex"]),
+    "cf": mc_arg(["loc_content", "format"]),
+    "cjs": mc_arg(["loc_content", "js_script"]),
+    "cxs": mc_arg(["loc_content", "xpath_sibling_match_depth"], parse_non_negative_int_arg, True, INT_MAX),
+    "cmm": mc_arg(["loc_content", "multimatch"], parse_bool_arg, True),
+    "cin": mc_arg(["loc_content", "interactive"], parse_bool_arg, True),
+    "cimin": mc_arg(["cimin"], parse_int_arg),
+    "cimax": mc_arg(["cimax"], parse_int_arg),
+    "cicont": mc_arg(["ci_continuous"], parse_bool_arg, True),
+
+    "cff": mc_arg(["content_forward_format"]),
+    "cfc": mc_range_arg(["content_forward_chains"]),
+    "cpf": mc_arg(["content_print_format"]),
+    "cwf": mc_arg(["content_write_format"]),
+    "csf": mc_arg(["content_save_format"]),
+    "cshf": mc_arg(["content_shell_command_format"]),
+    "cshif": mc_arg(["content_shell_command_stdin_format"]),
+    "cshp": mc_arg(["content_shell_command_print_output"], parse_bool_arg, True),
+    "csin": mc_arg(["save_path_interactive"], parse_bool_arg, True),
+
+    "cienc": mc_arg(["content_input_encoding"], parse_encoding_arg),
+    "cfienc": mc_arg(["content_force_input_encoding"], parse_encoding_arg),
+
+    "cl": mc_arg(["content_raw"], lambda v, arg: not parse_bool_arg(v, arg), True),
+    "cesc": mc_arg(["content_escape_sequence"]),
+
+    # label args
+    "lx": mc_arg(["loc_label", "xpath"]),
+    "lr": mc_arg(["loc_label", "regex"]),
+    "lf": mc_arg(["loc_label", "format"]),
+    "ljs": mc_arg(["loc_label", "js_script"]),
+    "lxs": mc_arg(["loc_label", "xpath_sibling_match_depth"], parse_non_negative_int_arg, True, INT_MAX),
+    "lmm": mc_arg(["loc_label", "multimatch"], parse_bool_arg, True),
+    "lin": mc_arg(["loc_label", "interactive"], parse_bool_arg, True),
+    "las": mc_arg(["allow_slashes_in_labels"], parse_bool_arg, True),
+    "lic": mc_arg(["labels_inside_content"], parse_bool_arg, True),
+    "lam": mc_arg(["label_allow_missing"], parse_bool_arg, True),
+    "ldf": mc_arg(["label_default_format"], parse_bool_arg, True),
+    "fdf": mc_arg(["filename_default_format"], parse_bool_arg, True),
+
+    # document args
+    "dx": mc_arg(["loc_document", "xpath"]),
+    "dr": mc_arg(["loc_document", "regex"]),
+    "df": mc_arg(["loc_document", "format"]),
+    "djs": mc_arg(["loc_document", "js_script"]),
+    "dxs": mc_arg(["loc_document", "xpath_sibling_match_depth"], parse_non_negative_int_arg, True, INT_MAX),
+    "doc": mc_range_arg(["document_output_chains"]),
+    "dmm": mc_arg(["loc_document", "multimatch"], parse_bool_arg, True),
+    "din": mc_arg(["loc_document", "interactive"], parse_bool_arg, True),
+
+    "dimin": mc_arg(["dimin"], parse_int_arg),
+    "dimax": mc_arg(["dimax"], parse_int_arg),
+
+    "owf": mc_arg(["overwrite_files"], parse_bool_arg, True),
+
+    "denc": mc_arg(["default_document_encoding"], parse_encoding_arg),
+    "dfenc": mc_arg(["force_document_encoding"], parse_encoding_arg),
+
+    "dsch": mc_arg(["default_document_scheme"]),
+    "dpsch": mc_arg(["prefer_parent_document_scheme"]),
+    "dfsch": mc_arg(["force_document_scheme"], parse_bool_arg, True),
+
+    "dd": mc_arg(
+        ["document_duplication"],
+        lambda v, arg: parse_variant_arg(v, document_duplication_dict, arg)
+    ),
+
+    "base": mc_arg(["file_base"]),
+    "rbase": mc_arg(["url_base"]),
+    "fbase": mc_arg(["force_mc_base"], parse_bool_arg, True),
+
+    # misc args
+    "selstrat": mc_arg(
+        ["selenium_strategy"],
+        lambda v, arg: parse_variant_arg(v, selenium_strats_dict, arg)
+    ),
+    "seldl": mc_arg(
+        ["selenium_download_strategy"],
+        lambda v, arg: parse_variant_arg(v, selenium_download_strategies_dict, arg)
+    ),
+
+    # Documents
+    "url": doc_arg(DocumentType.URL),
+    "rfile": doc_arg(DocumentType.RFILE),
+    "file": doc_arg(DocumentType.FILE),
+    "str": doc_arg(DocumentType.STRING),
+    "rstr": doc_arg(DocumentType.RSTRING),
+    "stdin": doc_arg_stdin(DocumentType.STRING),
+    "rstdin": doc_arg_stdin(DocumentType.RSTRING),
+
+    "cookiefile": ctx_arg("cookie_file"),
+
+    # Global Options
+    "sel": ctx_arg(
+        "selenium_variant",
+        lambda v, arg: parse_variant_arg(
+            v, selenium_variants_dict, arg, SeleniumVariant.FIREFOX
+        ),
+        True
+    ),
+    "selh": ctx_arg("selenium_headless", parse_bool_arg, True),
+    "selkeep": ctx_arg("selenium_keep_alive", parse_bool_arg, True),
+    "tbdir": ctx_arg("tor_browser_dir"),
+    "bfs": ctx_arg("documents_bfs", parse_bool_arg, True),
+    "ua": ctx_arg("user_agent"),
+    "uar": ctx_arg("user_agent_random", parse_bool_arg, True),
+    "v": ctx_arg("verbosity", lambda v, arg: parse_variant_arg(v, verbosities_dict, arg)),
+    "prog": ctx_arg("enable_status_reports", parse_bool_arg, True),
+
+    "repl": ctx_arg("repl", parse_bool_arg, True),
+    "--repl": ctx_arg("repl", parse_bool_arg, True),
+
+    "mt": ctx_arg("max_download_threads", parse_int_arg),
+
+    "exit": ctx_arg("exit", parse_bool_arg, True),
+
+    "timeout": ctx_arg("request_timeout_seconds", parse_non_negative_float_arg),
+}
+
+
 def print_version() -> None:
     print(f"{SCRIPT_NAME} {VERSION}")
 
@@ -584,204 +757,12 @@ def parse_args(ctx: 'scr_context.ScrContext', args: Iterable[str]) -> None:
             ctx.special_args_occured = True
             continue
 
-        # we need a "infinite" int value default fox cxs/lxs/dxs
-        int_max = 2**64 - 1
-
-        # content args
-        if apply_mc_arg(ctx, "cx", ["loc_content", "xpath"], arg):
-            continue
-        if apply_mc_arg(ctx, "cr", ["loc_content", "regex"], arg):
-            continue
-        if apply_mc_arg(ctx, "cf", ["loc_content", "format"], arg):
-            continue
-        if apply_mc_arg(ctx, "cjs", ["loc_content", "js_script"], arg):
-            continue
-        if apply_mc_arg(ctx, "cxs", ["loc_content", "xpath_sibling_match_depth"], arg, parse_non_negative_int_arg, True, int_max):
-            continue
-        if apply_mc_arg(ctx, "cmm", ["loc_content", "multimatch"], arg, parse_bool_arg, True):
-            continue
-        if apply_mc_arg(ctx, "cin", ["loc_content", "interactive"], arg, parse_bool_arg, True):
-            continue
-        if apply_mc_arg(ctx, "cimin", ["cimin"], arg, parse_int_arg):
-            continue
-        if apply_mc_arg(ctx, "cimax", ["cimax"], arg, parse_int_arg):
-            continue
-        if apply_mc_arg(ctx, "cicont", ["ci_continuous"], arg, parse_bool_arg, True):
-            continue
-
-        if apply_mc_arg(ctx, "cff", ["content_forward_format"], arg):
-            continue
-        if apply_mc_arg(ctx, "cfc", ["content_forward_chains"], arg, lambda v, arg: parse_mc_arg_as_range(ctx, arg, v)):
-            continue
-        if apply_mc_arg(ctx, "cpf", ["content_print_format"], arg):
-            continue
-        if apply_mc_arg(ctx, "cwf", ["content_write_format"], arg):
-            continue
-        if apply_mc_arg(ctx, "csf", ["content_save_format"], arg):
-            continue
-        if apply_mc_arg(ctx, "cshf", ["content_shell_command_format"], arg):
-            continue
-        if apply_mc_arg(ctx, "cshif", ["content_shell_command_stdin_format"], arg):
-            continue
-        if apply_mc_arg(ctx, "cshp", ["content_shell_command_print_output"], arg, parse_bool_arg, True):
-            continue
-        if apply_mc_arg(ctx, "csin", ["save_path_interactive"], arg, parse_bool_arg, True):
-            continue
-
-        if apply_mc_arg(ctx, "cienc", ["content_input_encoding"], arg, parse_encoding_arg):
-            continue
-        if apply_mc_arg(ctx, "cfienc", ["content_force_input_encoding"], arg, parse_encoding_arg):
-            continue
-
-        if apply_mc_arg(ctx, "cl", ["content_raw"], arg, lambda v, arg: not parse_bool_arg(v, arg), True): continue
-        if apply_mc_arg(ctx, "cesc", ["content_escape_sequence"], arg):
-            continue
-
-        # label args
-        if apply_mc_arg(ctx, "lx", ["loc_label", "xpath"], arg):
-            continue
-        if apply_mc_arg(ctx, "lr", ["loc_label", "regex"], arg):
-            continue
-        if apply_mc_arg(ctx, "lf", ["loc_label", "format"], arg):
-            continue
-        if apply_mc_arg(ctx, "ljs", ["loc_label", "js_script"], arg):
-            continue
-        if apply_mc_arg(ctx, "lxs", ["loc_label", "xpath_sibling_match_depth"], arg, parse_non_negative_int_arg, True, int_max):
-            continue
-        if apply_mc_arg(ctx, "lmm", ["loc_label", "multimatch"], arg, parse_bool_arg, True):
-            continue
-        if apply_mc_arg(ctx, "lin", ["loc_label", "interactive"], arg, parse_bool_arg, True):
-            continue
-        if apply_mc_arg(ctx, "las", ["allow_slashes_in_labels"], arg, parse_bool_arg, True):
-            continue
-        if apply_mc_arg(ctx, "lic", ["labels_inside_content"], arg, parse_bool_arg, True):
-            continue
-        if apply_mc_arg(ctx, "lam", ["label_allow_missing"], arg, parse_bool_arg, True):
-            continue
-        if apply_mc_arg(ctx, "ldf", ["label_default_format"], arg, parse_bool_arg, True):
-            continue
-        if apply_mc_arg(ctx, "fdf", ["filename_default_format"], arg, parse_bool_arg, True):
-            continue
-
-        # document args
-        if apply_mc_arg(ctx, "dx", ["loc_document", "xpath"], arg):
-            continue
-        if apply_mc_arg(ctx, "dr", ["loc_document", "regex"], arg):
-            continue
-        if apply_mc_arg(ctx, "df", ["loc_document", "format"], arg):
-            continue
-        if apply_mc_arg(ctx, "djs", ["loc_document", "js_script"], arg):
-            continue
-        if apply_mc_arg(ctx, "dxs", ["loc_document", "xpath_sibling_match_depth"], arg, parse_non_negative_int_arg, True, int_max):
-            continue
-        if apply_mc_arg(ctx, "doc", ["document_output_chains"], arg, lambda v, arg: parse_mc_arg_as_range(ctx, arg, v)):
-            continue
-        if apply_mc_arg(ctx, "dmm", ["loc_document", "multimatch"], arg, parse_bool_arg, True):
-            continue
-        if apply_mc_arg(ctx, "din", ["loc_document", "interactive"], arg, parse_bool_arg, True):
-            continue
-
-        if apply_mc_arg(ctx, "dimin", ["dimin"], arg, parse_int_arg):
-            continue
-        if apply_mc_arg(ctx, "dimax", ["dimax"], arg, parse_int_arg):
-            continue
-
-        if apply_mc_arg(ctx, "owf", ["overwrite_files"], arg, parse_bool_arg, True):
-            continue
-
-        if apply_mc_arg(ctx, "denc", ["default_document_encoding"], arg, parse_encoding_arg):
-            continue
-        if apply_mc_arg(ctx, "dfenc", ["force_document_encoding"], arg, parse_encoding_arg):
-            continue
-
-        if apply_mc_arg(ctx, "dsch", ["default_document_scheme"], arg):
-            continue
-        if apply_mc_arg(ctx, "dpsch", ["prefer_parent_document_scheme"], arg):
-            continue
-        if apply_mc_arg(ctx, "dfsch", ["force_document_scheme"], arg, parse_bool_arg, True):
-            continue
-
-        if apply_mc_arg(
-            ctx, "dd", ["document_duplication"], arg,
-            lambda v, arg: parse_variant_arg(v, document_duplication_dict, arg),
-        ): continue
-
-        if apply_mc_arg(ctx, "base", ["file_base"], arg):
-            continue
-
-        if apply_mc_arg(ctx, "rbase", ["url_base"], arg):
-            continue
-
-        if apply_mc_arg(ctx, "fbase", ["force_mc_base"], arg, parse_bool_arg, True):
-            continue
-
-        # misc args
-        if apply_mc_arg(
-            ctx, "selstrat", ["selenium_strategy"], arg,
-            lambda v, arg: parse_variant_arg(v, selenium_strats_dict, arg)
-        ): continue
-        if apply_mc_arg(
-            ctx, "seldl", ["selenium_download_strategy"], arg,
-            lambda v, arg: parse_variant_arg(v, selenium_download_strategies_dict, arg)
-        ): continue
-
-        # Documents
-        if apply_doc_arg(ctx, "url", DocumentType.URL, arg):
-            continue
-        if apply_doc_arg(ctx, "rfile", DocumentType.RFILE, arg):
-            continue
-        if apply_doc_arg(ctx, "file", DocumentType.FILE, arg):
-            continue
-        if apply_doc_arg(ctx, "str", DocumentType.STRING, arg):
-            continue
-        if apply_doc_arg(ctx, "rstr", DocumentType.RSTRING, arg):
-            continue
-        if apply_doc_arg_stdin(ctx, "stdin", arg, DocumentType.STRING):
-            continue
-        if apply_doc_arg_stdin(ctx, "rstdin", arg, DocumentType.RSTRING):
-            continue
-
-        if apply_ctx_arg(ctx, "cookiefile", "cookie_file", arg):
-            continue
-
-        # Global Options
-        if apply_ctx_arg(
-            ctx, "sel", "selenium_variant", arg,
-            lambda v, arg: parse_variant_arg(
-                v, selenium_variants_dict, arg, SeleniumVariant.FIREFOX
-            ),
-            True
-        ): continue
-        if apply_ctx_arg(ctx, "selh", "selenium_headless", arg, parse_bool_arg, True):
-            continue
-        if apply_ctx_arg(ctx, "selkeep", "selenium_keep_alive", arg, parse_bool_arg, True):
-            continue
-        if apply_ctx_arg(ctx, "tbdir", "tor_browser_dir", arg):
-            continue
-        if apply_ctx_arg(ctx, "bfs", "documents_bfs", arg, parse_bool_arg, True):
-            continue
-        if apply_ctx_arg(ctx, "ua", "user_agent", arg):
-            continue
-        if apply_ctx_arg(ctx, "uar", "user_agent_random", arg, parse_bool_arg, True):
-            continue
-        if apply_ctx_arg(ctx, "v", "verbosity", arg, lambda v, arg: parse_variant_arg(v, verbosities_dict, arg)):
-            continue
-        if apply_ctx_arg(ctx, "prog", "enable_status_reports", arg, parse_bool_arg, True):
-            continue
-
-        if apply_ctx_arg(ctx, "repl", "repl", arg,  parse_bool_arg, True):
-            continue
-
-        if apply_ctx_arg(ctx, "mt", "max_download_threads", arg,  parse_int_arg):
-            continue
-
-        if apply_ctx_arg(ctx, "--repl", "repl", arg,  parse_bool_arg, True):
-            continue
-
-        if apply_ctx_arg(ctx, "exit", "exit", arg,  parse_bool_arg, True):
-            continue
-
-        if apply_ctx_arg(ctx, "timeout", "request_timeout_seconds", arg,  parse_non_negative_float_arg):
+        # the pattern can match the empty string, so this always succeeds
+        argname_match = ARG_NAME_REGEX.match(arg)
+        assert argname_match is not None
+        argname = argname_match[0]
+        arg_handler = ARG_HANDLERS.get(argname)
+        if arg_handler is not None and arg_handler(ctx, argname, arg):
             continue
 
         raise ScrSetupError(f"unrecognized option: '{arg}'")
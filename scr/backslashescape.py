@@ -1,4 +1,5 @@
 import re
+import functools
 from typing import cast
 
 BSE_X_REGEX_MATCH = re.compile("[0-9A-Fa-f]{2}")
@@ -47,6 +48,8 @@ BSE_PATTERNS = [
 ]
 
 
+# the same (default) format strings get unescaped for every match chain
+@functools.lru_cache(maxsize=256)
 def unescape_string(txt: str) -> str:
     for regex, parser in BSE_PATTERNS:
         txt = regex.sub(parser, txt)
@@ -1,4 +1,7 @@
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, TypeVar
+import copy
+
+CDC = TypeVar("CDC", bound="ConfigDataClass")
 
 
 class ConfigDataClass:
@@ -24,21 +27,37 @@ class ConfigDataClass:
         return list(k for k in annotations.keys() if k not in subconfig_slots_dict)
 
     def apply_defaults(self, defaults: 'ConfigDataClass') -> None:
+        self_dict = self.__dict__
+        final_values = self._final_values_
+        defaults_dict = defaults.__dict__
+        defaults_class_dict = defaults.__class__.__dict__
         for cs in self.__class__._config_slots_:
-            if cs in defaults.__dict__:
-                def_val = defaults.__dict__[cs]
+            if cs in final_values and cs in self_dict:
+                continue
+            # only look up the default for slots that actually take it
+            if cs in defaults_dict:
+                def_val = defaults_dict[cs]
             else:
-                def_val = defaults.__class__.__dict__[cs]
-            if cs not in self.__dict__ or cs not in self._final_values_:
-                self.__dict__[cs] = def_val
-                self._final_values_.add(cs)
-                vs = defaults._value_sources_.get(cs, None)
-                if vs:
-                    self._value_sources_[cs] = vs
+                def_val = defaults_class_dict[cs]
+            self_dict[cs] = def_val
+            final_values.add(cs)
+            vs = defaults._value_sources_.get(cs, None)
+            if vs:
+                self._value_sources_[cs] = vs
 
         for scs in self.__class__._subconfig_slots_:
             self.__dict__[scs].apply_defaults(defaults.__dict__[scs])
 
+    def clone(self: CDC) -> CDC:
+        # shallow copy that only duplicates our own bookkeeping and the
+        # subconfigs, config values themselves are shared
+        res = copy.copy(self)
+        res._final_values_ = set(self._final_values_)
+        res._value_sources_ = dict(self._value_sources_)
+        for scs in self.__class__._subconfig_slots_:
+            res.__dict__[scs] = self.__dict__[scs].clone()
+        return res
+
     def follow_attrib_path(self, attrib_path: list[str]) -> tuple['ConfigDataClass', str]:
         assert len(attrib_path)
         conf = self
@@ -17,6 +17,10 @@ class ContentMatch:
 
     url_parsed: Optional[urllib.parse.ParseResult] = None
 
+    # computed lazily, since e.g. dummy content matches are never hashed
+    _key: Optional[Any] = None
+    _hash: Optional[int] = None
+
     def __init__(
         self,
         clm: 'locator.LocatorMatch',
@@ -31,13 +35,19 @@ class ContentMatch:
         self.base = doc.base
 
     def __key__(self) -> Any:
-        return (
-            self.doc, self.clm.__key__(),
-            self.llm.__key__() if self.llm else None,
-        )
+        # the locator matches are final once a content match is created,
+        # so we only build the key once instead of on every deduplication lookup
+        if self._key is None:
+            self._key = (
+                self.doc, self.clm.__key__(),
+                self.llm.__key__() if self.llm else None,
+            )
+        return self._key
 
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, self.__class__) and other.__key__() == self.__key__()
 
     def __hash__(self) -> int:
-        return hash(self.__key__())
+        if self._hash is None:
+            self._hash = hash(self.__key__())
+        return self._hash
@@ -102,13 +102,7 @@ class DocumentType(Enum):
     RSTRING = 5
 
     def derived_link_type(self) -> 'DocumentType':
-        return {
-            DocumentType.URL: DocumentType.URL,
-            DocumentType.FILE: DocumentType.FILE,
-            DocumentType.RFILE: DocumentType.URL,
-            DocumentType.STRING: DocumentType.FILE,
-            DocumentType.RSTRING: DocumentType.URL,
-        }[self]
+        return derived_link_type_dict[self]
 
     def non_r_type(self) -> 'DocumentType':
         if self == DocumentType.RFILE:
@@ -118,6 +112,15 @@ class DocumentType(Enum):
         return self
 
 
+# type of the documents that links matched in a document of a given type refer to
+derived_link_type_dict: dict[DocumentType, DocumentType] = {
+    DocumentType.URL: DocumentType.URL,
+    DocumentType.FILE: DocumentType.FILE,
+    DocumentType.RFILE: DocumentType.URL,
+    DocumentType.STRING: DocumentType.FILE,
+    DocumentType.RSTRING: DocumentType.URL,
+}
+
 document_type_dict: dict[str, DocumentType] = {
     "url": DocumentType.URL,
     "file": DocumentType.FILE,
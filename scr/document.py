@@ -3,6 +3,7 @@ from .definitions import (DocumentType)
 from . import locator, match_chain, scr_context, utils
 import lxml.html
 import urllib
+import concurrent.futures
 
 
 class Document:
@@ -20,6 +21,7 @@ class Document:
     locator_match: Optional['locator.LocatorMatch']
     parent_doc: Optional['Document']
     dfmatch: Optional[str]
+    prefetch: Optional['concurrent.futures.Future[tuple[Any, Optional[str]]]']
 
     def __init__(
         self, document_type: DocumentType,
@@ -44,6 +46,7 @@ class Document:
         self.src_mc = src_mc
         self.locator_match = locator_match
         self.dfmatch = None
+        self.prefetch = None
         if not match_chains:
             self.match_chains = []
         else:
@@ -6,16 +6,13 @@ from .definitions import (
     SeleniumDownloadStrategy, ScrFetchError, SeleniumVariant, DEFAULT_CWF
 )
 from .input_sequences import (
-    YES_INDICATING_STRINGS, NO_INDICATING_STRINGS, EDIT_INDICATING_STRINGS,
-    CHAIN_SKIP_INDICATING_STRINGS, DOC_SKIP_INDICATING_STRINGS,
-    INSPECT_INDICATING_STRINGS
+    INTERACTIVE_PROMPT_OPTIONS, INTERACTIVE_PROMPT_OPTIONS_WITH_INSPECT
 )
 from typing import Any, Optional, BinaryIO, Union, cast, Iterator
 import os
 import urllib
 import time
 import sys
-from tbselenium.tbdriver import TorBrowserDriver
 from selenium.common.exceptions import WebDriverException as SeleniumWebDriverException
 from selenium.webdriver.remote.webdriver import WebDriver as SeleniumWebDriver
 import binascii
@@ -32,6 +29,11 @@ from enum import Enum
 
 DEFAULT_MAX_PRINT_BUFFER_CAPACITY = 2**20 * 100  # 100 MiB
 DEFAULT_RESPONSE_BUFFER_SIZE = 32768
+SELENIUM_LIVENESS_CHECK_INTERVAL_SECONDS = 1.0
+# how long an empty download target has to stay untouched before we
+# believe that the download really was empty
+SELENIUM_EMPTY_DOWNLOAD_SETTLE_SECONDS = 1.0
+DEFAULT_SAVE_FILE_BUFFER_SIZE = 2**16
 
 
 class ContentFormat(Enum):
@@ -98,8 +100,12 @@ class PrintOutputManager:
     active_id: int = 0
     active_id_stderr: bool = False
     main_thread_id: Optional[int] = None
+    # flushing after every output only matters if someone is watching,
+    # when stdout is redirected we let the buffer fill up instead
+    flush_stdout: bool
 
     def __init__(self, max_buffer_size: int = DEFAULT_MAX_PRINT_BUFFER_CAPACITY) -> None:
+        self.flush_stdout = sys.stdout.isatty()
         self.lock = threading.Lock()
         self.printing_buffers = OrderedDict()
         self.finished_queues = set()
@@ -204,10 +210,16 @@ class PrintOutputManager:
                         break
             if new_active_id is None:
                 break
+        if self.flush_stdout:
+            sys.stdout.flush()
 
     def flush(self, id: int) -> None:
+        if not self.flush_stdout:
+            return
         with self.lock:
-            if not id != self.active_id:
+            # output of inactive ids is still buffered by us,
+            # so there is nothing in stdout to flush for them
+            if id != self.active_id:
                 return
         sys.stdout.flush()
 
@@ -271,7 +283,9 @@ class ResponseStreamWrapper(MinimalInputStream):
         buf_pos = goal_position - self._pos
         self._pos = goal_position
         res = self._bytes_buffer[0:buf_pos]
-        self._bytes_buffer = self._bytes_buffer[buf_pos:]
+        # deleting from the front of a bytearray just moves its start,
+        # slicing would copy the remainder for every read
+        del self._bytes_buffer[0:buf_pos]
         return res
 
     def close(self) -> None:
@@ -284,6 +298,53 @@ class ResponseStreamWrapper(MinimalInputStream):
         self.close()
 
 
+class BrowserDownloadWatcher:
+    # there is no api to tell when a download started by clicking a link
+    # is done, so we infer that from the files the browser creates:
+    # firefox creates the empty target file, streams into a '.part' file
+    # next to it and moves that onto the target at the end.
+    # chrome streams into a '.crdownload' file and renames that
+    path: str
+    part_path: str
+    crdownload_path: str
+    started: bool
+    partial_file_seen: bool
+    last_size: Optional[int]
+    last_size_change: float
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.part_path = path + ".part"
+        self.crdownload_path = path + ".crdownload"
+        self.started = False
+        self.partial_file_seen = False
+        self.last_size = None
+        self.last_size_change = 0
+
+    def poll(self, now: float) -> bool:
+        if os.path.exists(self.part_path) or os.path.exists(self.crdownload_path):
+            self.started = True
+            self.partial_file_seen = True
+            self.last_size = None
+            return False
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            self.last_size = None
+            return False
+        self.started = True
+        if self.partial_file_seen:
+            return True
+        # we might have looked right between firefox creating the target
+        # and the '.part' file, or chrome might have used a partial file
+        # name we don't know, so the target has to stay the same for a bit
+        if size != self.last_size:
+            self.last_size = size
+            self.last_size_change = now
+            return False
+        return size > 0 or now - self.last_size_change >= SELENIUM_EMPTY_DOWNLOAD_SETTLE_SECONDS
+
+
 class DownloadJob:
     save_file: Optional[BinaryIO] = None
     temp_file: Optional[BinaryIO] = None
@@ -376,8 +437,8 @@ class DownloadJob:
         if cm.llm is None:
             if cm.mc.need_label:
                 cm.llm = locator.LocatorMatch()
-                cm.llm.fres = cast(str, cm.mc.label_default_format).format(
-                    **scr.content_match_build_format_args(cm)
+                cm.llm.fres = cast(str, cm.mc.label_default_format).format_map(
+                    scr.content_match_build_format_args(cm)
                 )
                 cm.llm.result = cm.llm.fres
         else:
@@ -394,19 +455,12 @@ class DownloadJob:
                         f'"{cm.doc.path}": labels cannot contain a slash ("{cm.llm.result}")'
                     )
                 else:
-                    prompt_options = [
-                        (InteractiveResult.ACCEPT, YES_INDICATING_STRINGS),
-                        (InteractiveResult.REJECT, NO_INDICATING_STRINGS),
-                        (InteractiveResult.EDIT, DOC_SKIP_INDICATING_STRINGS),
-                        (InteractiveResult.SKIP_CHAIN, CHAIN_SKIP_INDICATING_STRINGS),
-                        (InteractiveResult.SKIP_DOC, DOC_SKIP_INDICATING_STRINGS)
-                    ]
                     if cm.mc.content_raw:
-                        prompt_options.append(
-                            (InteractiveResult.INSPECT, INSPECT_INDICATING_STRINGS))
+                        prompt_options = INTERACTIVE_PROMPT_OPTIONS_WITH_INSPECT
                         inspect_opt_str = "/inspect"
                         prompt_msg = f'"{cm.doc.path}"{di_ci_context}: accept content label "{cm.llm.result}"'
                     else:
+                        prompt_options = INTERACTIVE_PROMPT_OPTIONS
                         inspect_opt_str = ""
                         prompt_msg = f'"{cm.doc.path}": {content_type} {cm.clm.result}{di_ci_context}: accept content label "{cm.llm.result}"'
 
@@ -454,7 +508,9 @@ class DownloadJob:
             )
             save_path = None
         while True:
-            if save_path and not os.path.exists(os.path.dirname(os.path.abspath(save_path))):
+            # a relative path without directory component refers to the cwd,
+            # which we don't need to resolve (abspath) just to stat it
+            if save_path and not os.path.isdir(os.path.dirname(save_path) or "."):
                 self.log(
                     Verbosity.ERROR,
                     f"{cm.doc.path}{scr.get_ci_di_context(cm)}: directory of generated save path does not exist"
@@ -467,14 +523,7 @@ class DownloadJob:
             if save_path:
                 res = scr.prompt(
                     f'{cm.doc.path}{scr.get_ci_di_context(cm)}: accept save path "{save_path}" [Yes/no/edit/chainskip/docskip]? ',
-                    [
-                        (InteractiveResult.ACCEPT, YES_INDICATING_STRINGS),
-                        (InteractiveResult.REJECT, NO_INDICATING_STRINGS),
-                        (InteractiveResult.EDIT, EDIT_INDICATING_STRINGS),
-                        (InteractiveResult.SKIP_CHAIN,
-                         CHAIN_SKIP_INDICATING_STRINGS),
-                        (InteractiveResult.SKIP_DOC, DOC_SKIP_INDICATING_STRINGS)
-                    ],
+                    INTERACTIVE_PROMPT_OPTIONS,
                     InteractiveResult.ACCEPT
                 )
                 if res == InteractiveResult.ACCEPT:
@@ -512,6 +561,7 @@ class DownloadJob:
     def selenium_download_external(self) -> bool:
         proxies = None
         if self.cm.mc.ctx.selenium_variant == SeleniumVariant.TORBROWSER:
+            from tbselenium.tbdriver import TorBrowserDriver
             tbdriver = cast(TorBrowserDriver, self.cm.mc.ctx.selenium_driver)
             proxies = {
                 "http": f"socks5h://localhost:{tbdriver.socks_port}",
@@ -547,7 +597,7 @@ class DownloadJob:
         doc_url_str = selenium_setup.selenium_get_url(self.cm.mc.ctx)
         if doc_url_str is None:
             return False
-        doc_url = urllib.parse.urlparse(doc_url_str)
+        doc_url = utils.urlparse_cached(doc_url_str)
 
         if doc_url.netloc != cast(urllib.parse.ParseResult, self.cm.url_parsed).netloc:
             self.log(
@@ -581,21 +631,31 @@ class DownloadJob:
                     + f"selenium download failed: {str(ex)}"
                 )
             return False
-        i = 0
-        while True:
-            if os.path.exists(tmp_path):
-                time.sleep(0.1)
-                break
-            if i < 10:
-                time.sleep(0.01)
-            else:
-                time.sleep(0.1)
-                if i > 15:
-                    i = 10
-                    if selenium_setup.selenium_has_died(self.cm.mc.ctx):
-                        return False
-
-            i += 1
+        watcher = BrowserDownloadWatcher(tmp_path)
+        # if the browser doesn't start the download at all (e.g. because
+        # the link navigated instead) we would otherwise wait forever
+        start_deadline = time.monotonic() + self.cm.mc.ctx.request_timeout_seconds
+        delay = 0.005
+        # asking the browser whether it's still alive is a webdriver
+        # round trip, so we rate limit that independently of the polling
+        next_liveness_check = time.monotonic() + SELENIUM_LIVENESS_CHECK_INTERVAL_SECONDS
+        while not watcher.poll(time.monotonic()):
+            if not watcher.started and time.monotonic() > start_deadline:
+                self.log(
+                    Verbosity.ERROR,
+                    f"{self.cm.clm.result}{scr.get_ci_di_context(self.cm)}: "
+                    + "selenium download failed: timed out waiting for the download to start"
+                )
+                return False
+            time.sleep(delay)
+            # back off so quick downloads are noticed early
+            # without hammering the filesystem for slow ones
+            delay = min(delay * 2, 0.1)
+            now = time.monotonic()
+            if now > next_liveness_check:
+                next_liveness_check = now + SELENIUM_LIVENESS_CHECK_INTERVAL_SECONDS
+                if selenium_setup.selenium_has_died(self.cm.mc.ctx):
+                    return False
         self.content = tmp_path
         self.content_format = ContentFormat.TEMP_FILE
         # TODO: maybe support filenames here ?
@@ -648,7 +708,7 @@ class DownloadJob:
             err = res["error"]
         if err is not None:
             cors_warn = ""
-            if urllib.parse.urlparse(doc_url).netloc != urllib.parse.urlparse(self.cm.clm.result).netloc:
+            if utils.urlparse_cached(doc_url).netloc != cast(urllib.parse.ParseResult, self.cm.url_parsed).netloc:
                 cors_warn = " (potential CORS issue)"
             self.log(
                 Verbosity.ERROR,
@@ -772,8 +832,11 @@ class DownloadJob:
                 self.save_path,
                 ("w" if self.cm.mc.overwrite_files else "x")
                 + "b"
-                + ("+" if use_as_multipass else "")
+                + ("+" if use_as_multipass else ""),
+                buffering=DEFAULT_SAVE_FILE_BUFFER_SIZE
             ))
+            # so we close (and therefore flush) it once the job is done
+            self.save_file = save_file
             if use_as_multipass:
                 self.multipass_file = save_file
         except FileExistsError:
@@ -795,6 +858,41 @@ class DownloadJob:
         ))
         return True
 
+    def try_move_temp_file_to_save_path(self) -> bool:
+        # when the temp file would only be copied verbatim into the save file,
+        # we can move it there instead of streaming it through memory
+        mc = self.cm.mc
+        if (
+            self.content_format != ContentFormat.TEMP_FILE
+            or not self.save_path
+            or mc.content_write_format != DEFAULT_CWF
+            or mc.content_print_format is not None
+            or mc.content_shell_command_format is not None
+            or mc.content_forward_format is not None
+        ):
+            return False
+        tmp_path = cast(str, self.content)
+        try:
+            size = os.path.getsize(tmp_path)
+            if mc.overwrite_files:
+                os.replace(tmp_path, self.save_path)
+            else:
+                # unlike os.replace, this fails if the file already exists
+                os.link(tmp_path, self.save_path)
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    # the file is saved, the leftover temp file is removed
+                    # together with the downloads temp dir at exit
+                    pass
+        except OSError:
+            # e.g. different file systems, fall back to copying
+            # (which also reports already existing files properly)
+            return False
+        if self.status_report:
+            self.status_report.submit_update(size)
+        return True
+
     def setup_content_file(self) -> bool:
         if self.content_format not in [ContentFormat.FILE, ContentFormat.TEMP_FILE]:
             return True
@@ -950,6 +1048,9 @@ class DownloadJob:
                 return None
 
             self.check_abort()
+            if self.try_move_temp_file_to_save_path():
+                success = True
+                return self.gen_output_doc()
             self.content_stream: Union[BinaryIO, MinimalInputStream, None] = (
                 cast(Union[BinaryIO, MinimalInputStream], self.content)
                 if self.content_format == ContentFormat.STREAM
@@ -1070,11 +1171,13 @@ class DownloadManager:
     pom: PrintOutputManager
     executor: concurrent.futures.ThreadPoolExecutor
     shell_output_handling_executor: concurrent.futures.ThreadPoolExecutor
+    document_prefetch_executor: concurrent.futures.ThreadPoolExecutor
     status_report_lock: threading.Lock
     download_status_reports: list['progress_report.DownloadStatusReport']
 
     def __init__(self, ctx: 'scr_context.ScrContext', max_threads: int) -> None:
         self.ctx = ctx
+        self.max_threads = max_threads
         self.pending_jobs = set()
         self.executor = concurrent.futures.ThreadPoolExecutor(
             max_workers=max_threads
@@ -1082,6 +1185,11 @@ class DownloadManager:
         self.shell_output_handling_executor = concurrent.futures.ThreadPoolExecutor(
             max_workers=2 * max_threads
         )
+        # kept separate from the download executor so a document fetch
+        # never has to queue up behind running content downloads
+        self.document_prefetch_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_threads
+        )
         self.pom = PrintOutputManager()
         self.status_report_lock = threading.Lock()
         self.download_status_reports = []
@@ -1146,6 +1254,8 @@ class DownloadManager:
             if cancel_running:
                 self.ctx.abort = True
             self.executor.shutdown(wait=True, cancel_futures=cancel_running)
+            # documents that were prefetched but never processed are useless now
+            self.document_prefetch_executor.shutdown(wait=True, cancel_futures=True)
 
 
 def advance_output_formatters(output_formatters: list['scr.OutputFormatter'], buf: Optional[bytes]) -> None:
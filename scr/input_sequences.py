@@ -1,6 +1,6 @@
 from typing import Iterable
 
-from .definitions import (T)
+from .definitions import (T, InteractiveResult)
 
 
 def prefixes(str: str) -> set[str]:
@@ -16,14 +16,14 @@ def set_join(*args: Iterable['T']) -> set['T']:
 
 class OptionIndicatingStrings:
     representative: str
-    matching: set[str]
+    matching: frozenset[str]
 
-    def __init__(self, representative: str, *args: set[str]) -> None:
+    def __init__(self, representative: str, *args: Iterable[str]) -> None:
         self.representative = representative
         if args:
-            self.matching = set_join(*args)
+            self.matching = frozenset(set_join(*args))
         else:
-            self.matching = prefixes(representative)
+            self.matching = frozenset(prefixes(representative))
 
 
 YES_INDICATING_STRINGS = OptionIndicatingStrings(
@@ -39,3 +39,29 @@ EDIT_INDICATING_STRINGS = OptionIndicatingStrings("edit")
 DOC_SKIP_INDICATING_STRINGS = OptionIndicatingStrings("docskip")
 INSPECT_INDICATING_STRINGS = OptionIndicatingStrings("inspect")
 ACCEPT_CHAIN_INDICATING_STRINGS = OptionIndicatingStrings("acceptchain")
+
+# prompt option tables shared by all prompts so we don't rebuild them on every call
+BOOL_PROMPT_OPTIONS: list[tuple[bool, OptionIndicatingStrings]] = [
+    (True, YES_INDICATING_STRINGS),
+    (False, NO_INDICATING_STRINGS),
+]
+INTERACTIVE_PROMPT_OPTIONS: list[tuple[InteractiveResult, OptionIndicatingStrings]] = [
+    (InteractiveResult.ACCEPT, YES_INDICATING_STRINGS),
+    (InteractiveResult.REJECT, NO_INDICATING_STRINGS),
+    (InteractiveResult.EDIT, EDIT_INDICATING_STRINGS),
+    (InteractiveResult.SKIP_CHAIN, CHAIN_SKIP_INDICATING_STRINGS),
+    (InteractiveResult.SKIP_DOC, DOC_SKIP_INDICATING_STRINGS),
+]
+INTERACTIVE_PROMPT_OPTIONS_WITH_INSPECT: list[tuple[InteractiveResult, OptionIndicatingStrings]] = [
+    *INTERACTIVE_PROMPT_OPTIONS,
+    (InteractiveResult.INSPECT, INSPECT_INDICATING_STRINGS),
+]
+PAGE_PROMPT_OPTIONS: list[tuple[InteractiveResult, OptionIndicatingStrings]] = [
+    (InteractiveResult.ACCEPT, YES_INDICATING_STRINGS),
+    (
+        InteractiveResult.SKIP_DOC,
+        OptionIndicatingStrings(
+            "skip", SKIP_INDICATING_STRINGS.matching, NO_INDICATING_STRINGS.matching
+        )
+    ),
+]
@@ -3,7 +3,7 @@ from .definitions import (ScrSetupError, ScrMatchError, Verbosity)
 from . import match_chain, scr, selenium_setup
 from .document import Document
 from .config_data_class import ConfigDataClass
-from typing import Optional, Any, cast
+from typing import Optional, Any, Callable, Mapping, cast
 import lxml.etree
 import lxml.html
 import re
@@ -39,8 +39,9 @@ class LocatorMatch:
         self.xml = xml
         self.match_args = {}
 
-    def __key__(self) -> tuple[Optional[str], Optional[lxml.html.HtmlElement], dict[str, str]]:
-        return (self.text, self.xml, self.match_args)
+    def __key__(self) -> tuple[Optional[str], Optional[lxml.html.HtmlElement], tuple[tuple[str, str], ...]]:
+        # match_args is a dict and therefore not hashable itself
+        return (self.text, self.xml, tuple(sorted(self.match_args.items())))
 
     def __eq__(self, other: Any) -> bool:
         return isinstance(other, self.__class__) and self.__key__() == other.__key__()
@@ -57,7 +58,10 @@ class LocatorMatch:
         return group_dict
 
     def copy(self) -> 'LocatorMatch':
-        return copy.copy(self)
+        res = copy.copy(self)
+        # steps add their args to the copy, which mustn't affect the original
+        res.match_args = dict(self.match_args)
+        return res
 
 
 class MatchStep(ABC, ConfigDataClass):
@@ -131,6 +135,7 @@ class RegexMatchStep(MatchStep):
     )
     step_type_index: int
     regex: re.Pattern[str]
+    unnamed_group_indices: list[int]
 
     def __init__(self, name: str, step_type_index: int, arg: str, arg_val: str) -> None:
         super().__init__(name, step_type_index, arg, arg_val)
@@ -140,32 +145,38 @@ class RegexMatchStep(MatchStep):
             self.regex = re.compile(self.arg_val, re.DOTALL | re.MULTILINE)
         except re.error as err:
             raise ScrSetupError(
-                f"invalid regex ({err.msg}) in {self.get_configuring_argument(['regex'])}"
+                f"invalid regex ({err.msg}) in {self.get_configuring_argument(['arg_val'])}"
             )
+        # named groups also show up in match.groups(), so we determine
+        # the indices of the remaining unnamed ones once here
+        named_group_indices = set(self.regex.groupindex.values())
+        self.unnamed_group_indices = sorted(
+            set(range(1, self.regex.groups + 1)) - named_group_indices
+        )
 
-    def apply_regex_match_args(self, lm: 'LocatorMatch', named_cgroups: dict[str, Any], unnamed_cgroups: list[Any]) -> None:
+    def apply_regex_match_args(self, lm: 'LocatorMatch', named_cgroups: dict[str, str], unnamed_cgroups: list[str]) -> None:
         for k, v in named_cgroups.items():
-            val = str(v) if v is not None else ""
-            self.apply_match_arg(lm, k, val)
-            lm.match_args[k] = val
+            self.apply_match_arg(lm, k, v)
+            lm.match_args[k] = v
 
         for i, g in enumerate(unnamed_cgroups):
-            val = str(g) if g is not None else ""
-            self.apply_match_arg(lm, str(i), val)
+            self.apply_match_arg(lm, str(i), g)
 
     def apply_regex_match_match_args(self, lm: 'LocatorMatch', match: re.Match[str]) -> None:
-        self.apply_regex_match_args(lm, match.groupdict(), cast(list[Any], match.groups()))
+        # let re substitute "" for groups that didn't participate,
+        # instead of checking every value for None ourselves
+        groups = match.groups("")
+        self.apply_regex_match_args(
+            lm, match.groupdict(""),
+            [groups[i - 1] for i in self.unnamed_group_indices]
+        )
 
     def apply_to_dummy_locator_match(self, lm: LocatorMatch) -> None:
         lm.rmatch = ""
-        capture_group_keys = list(self.regex.groupindex.keys())
-        unnamed_regex_group_count = (
-            self.regex.groups - len(capture_group_keys)
-        )
         self.apply_regex_match_args(
             lm,
-            {k: "" for k in capture_group_keys},
-            [""] * unnamed_regex_group_count
+            {k: "" for k in self.regex.groupindex.keys()},
+            [""] * len(self.unnamed_group_indices)
         )
         self.apply_match_arg(lm, "", "")
 
@@ -173,21 +184,22 @@ class RegexMatchStep(MatchStep):
         if self.regex is None:
             return lms
         lms_new = []
-        for lm in lms:
-            if not self.multimatch:
-                match = self.regex.match(lm.result)
+        if not self.multimatch:
+            # search gives us the first match directly, without
+            # setting up a finditer scanner
+            for lm in lms:
+                match = self.regex.search(lm.result)
                 if match:
                     self.apply_regex_match_match_args(lm, match)
                     lms_new.append(lm)
-                continue
+            return lms_new
+        for lm in lms:
             res: Optional[LocatorMatch] = lm
             for match in self.regex.finditer(lm.result):
                 if res is None:
                     res = lm.copy()
-                self.apply_regex_match_match_args(lm, match)
+                self.apply_regex_match_match_args(res, match)
                 lms_new.append(res)
-                if not self.multimatch:
-                    break
                 res = None
         return lms_new
 
@@ -226,7 +238,7 @@ class JSMatchStep(MatchStep):
                 results = drv.execute_script(self.js_script, *args_dict.values())  # type: ignore
 
             except SeleniumJavascriptException as ex:
-                arg = cast(str, self.get_configuring_argument(['js_script']))
+                arg = cast(str, self.get_configuring_argument(['arg_val']))
                 name = arg[0: arg.find("=")]
                 if self.loc.mc.ctx.last_doc_path:
                     on = f" on {self.loc.mc.ctx.last_doc_path}"
@@ -270,6 +282,10 @@ class PythonFormatStringMatchStep(MatchStep):
         MatchStep._annotations_as_config_slots(__annotations__, [])
     )
     loc: 'Locator'
+    # set during setup if the format string has no replacement fields
+    constant_result: Optional[str] = None
+    # bound arg_val.format_map, see setup
+    format_map: Callable[[Mapping[str, Any]], str]
 
     def __init__(self, name: str, step_type_index: int, arg: str, arg_val: str) -> None:
         super().__init__(name, step_type_index, arg, arg_val)
@@ -277,15 +293,36 @@ class PythonFormatStringMatchStep(MatchStep):
     def setup(self, loc: 'Locator', prev: Optional['MatchStep']) -> None:
         self.loc = loc
         scr.validate_format(
-            self, ["format"], loc.mc.gen_dummy_content_match(not loc.mc.content_raw), True, False
+            self, ["arg_val"], loc.mc.gen_dummy_content_match(not loc.mc.content_raw), True, False
         )
+        # without any keys the result doesn't depend on the match,
+        # so we can skip building the format args for each one of them
+        if not scr.get_format_string_keys(self.arg_val):
+            self.constant_result = self.arg_val.format()
+        # validate_format rejects positional keys, so we can hand our args
+        # dict to format_map directly instead of unpacking it into kwargs
+        self.format_map = self.arg_val.format_map
 
     def apply(self, lms: list[LocatorMatch]) -> list[LocatorMatch]:
-        for i, lm in enumerate(lms):
-            args_dict: dict[str, str] = {}
-            scr.apply_general_format_args(lm.doc, self.loc.mc, args_dict, self.loc.mc.ci + i)
+        if self.constant_result is not None:
+            for lm in lms:
+                lm.text = self.constant_result
+            return lms
+        mc = self.loc.mc
+        format_map = self.format_map
+        # all args except for ci only depend on the document, which
+        # the matches usually share, so we build them once per document
+        base_doc = None
+        base_args: dict[str, Any] = {}
+        for i, lm in enumerate(lms, mc.ci):
+            if lm.doc is not base_doc:
+                base_doc = lm.doc
+                base_args = {}
+                scr.apply_general_format_args(lm.doc, mc, base_args, None)
+            args_dict = base_args.copy()
+            args_dict["ci"] = i
             args_dict.update(lm.match_args)
-            lm.text = self.arg_val.format(**args_dict)
+            lm.text = format_map(args_dict)
         return lms
 
     def is_order_dependent(self) -> bool:
@@ -315,6 +352,11 @@ class Locator(ConfigDataClass):
         self.match_steps = []
         self.first_order_dependant_step = 0
 
+    def clone(self) -> 'Locator':
+        res = super().clone()
+        res.match_steps = [ms.clone() for ms in self.match_steps]
+        return res
+
     def is_active(self) -> bool:
         return len(self.match_steps) != 0
 
@@ -114,6 +114,18 @@ class MatchChain(ConfigDataClass):
         self.handled_document_matches = set()
         self.requested_document_urls = set()
 
+    def clone(self, chain_id: int) -> 'MatchChain':
+        res = super().clone()
+        res.chain_id = chain_id
+        res.document_output_chains = list(self.document_output_chains)
+        res.content_forward_chains = list(self.content_forward_chains)
+        res.content_matches = list(self.content_matches)
+        res.document_matches = list(self.document_matches)
+        res.handled_content_matches = set(self.handled_content_matches)
+        res.handled_document_matches = set(self.handled_document_matches)
+        res.requested_document_urls = set(self.requested_document_urls)
+        return res
+
     def gen_dummy_document(self) -> 'document.Document':
         d = document.Document(
             DocumentType.FILE, "",
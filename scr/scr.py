@@ -3,7 +3,10 @@ from datetime import datetime
 from typing import IO, Any, Optional, BinaryIO, Union, cast
 
 import shutil
-from io import BytesIO
+import mmap
+import threading
+import itertools
+import functools
 import shlex
 import lxml
 import lxml.etree
@@ -20,7 +23,7 @@ import pyparsing.exceptions
 
 import pathlib
 
-from http.cookiejar import MozillaCookieJar
+from http.cookiejar import MozillaCookieJar, DefaultCookiePolicy
 from selenium.webdriver.remote.webelement import WebElement as SeleniumWebElement
 import selenium.webdriver.common.by
 from selenium.webdriver.remote.webdriver import WebDriver as SeleniumWebDriver
@@ -34,7 +37,7 @@ import warnings
 import urllib.request
 from .utils import not_none
 from .definitions import (
-    T, K, DocumentDuplication, ScrSetupError, ScrFetchError, ScrMatchError, Verbosity, SCRIPT_NAME,
+    T, DocumentDuplication, ScrSetupError, ScrFetchError, ScrMatchError, Verbosity, SCRIPT_NAME,
     SeleniumVariant, SeleniumStrategy, SeleniumDownloadStrategy,
     DocumentType, InteractiveResult,
     verbosities_display_dict, document_type_display_dict,
@@ -42,9 +45,8 @@ from .definitions import (
 
 )
 from .input_sequences import (
-    OptionIndicatingStrings, YES_INDICATING_STRINGS, NO_INDICATING_STRINGS,
-    EDIT_INDICATING_STRINGS, DOC_SKIP_INDICATING_STRINGS, CHAIN_SKIP_INDICATING_STRINGS,
-    INSPECT_INDICATING_STRINGS, SKIP_INDICATING_STRINGS, set_join
+    OptionIndicatingStrings, BOOL_PROMPT_OPTIONS, INTERACTIVE_PROMPT_OPTIONS,
+    INTERACTIVE_PROMPT_OPTIONS_WITH_INSPECT, PAGE_PROMPT_OPTIONS
 )
 from . import (
     document, selenium_setup, utils, config_data_class, args_parsing, download_job,
@@ -58,12 +60,36 @@ else:
     import readline as rl
     readline = rl
 
+# Formatter is stateless, so we share one instance instead of
+# creating a new one for every format string we parse
+FORMATTER = Formatter()
+
+# requests.Session isn't guaranteed to be thread safe, so every thread
+# (main thread and download workers) gets its own pooled session
+REQUESTS_SESSIONS = threading.local()
+
+# prefetches for different hosts started together are spread out by this
+DOCUMENT_PREFETCH_STAGGER_SECONDS = 0.05
+
+
+# (literal text, already utf-8 encoded, key, format spec)
+FormatPart = tuple[bytes, Optional[str], Optional[str]]
+
+
+# every content match is formatted through an OutputFormatter, but there
+# are only a handful of distinct format strings, so we parse them once
+@functools.lru_cache(maxsize=64)
+def get_format_parts(format_str: str) -> tuple[FormatPart, ...]:
+    return tuple(
+        (text.encode("utf-8"), key, format_args)
+        for (text, key, format_args, _conv) in reversed(list(FORMATTER.parse(format_str)))
+    )
+
 
 class OutputFormatter:
     _args_dict: dict[str, Any]
     _args_list: list[Any]
-    _format_parts: list[tuple[str, Union[str, None],
-                              Union[str, None], Union[str, None]]]
+    _format_parts: list[FormatPart]
     _out_stream: Union['download_job.PrintOutputStream', 'download_job.ByteBuffer', IO[bytes]]
     _found_stream: bool = False
     _input_buffer_sizes: int
@@ -74,13 +100,13 @@ class OutputFormatter:
         content: Union[str, bytes, 'download_job.MinimalInputStream', BinaryIO, None],
     ) -> None:
         self._args_dict = content_match_build_format_args(cm, content)
-        self._args_list = []  # no positional args right now
+        # no positional args right now, otherwise this would have to be
+        # reversed like the format parts
+        self._args_list = []
 
-        # we reverse these lists so we can take out elements using pop()
-        self._format_parts = list(
-            reversed(list(Formatter().parse(format_str)))
-        )
-        self._args_list = list(reversed(self._args_list))
+        # the cached parts are already reversed so we can take out elements
+        # using pop(), we just need our own copy of the list
+        self._format_parts = list(get_format_parts(format_str))
 
         self._out_stream = out_stream
         self._found_stream = False
@@ -100,19 +126,22 @@ class OutputFormatter:
                 if not len(self._format_parts):
                     break
 
+            # collect everything up to the next stream into a single buffer
+            # so the output stream gets one write instead of one per part
+            pending = bytearray()
             while self._format_parts:
-                (text, key, format_args, _b) = self._format_parts.pop()
+                (text, key, format_args) = self._format_parts.pop()
                 if text:
-                    self._out_stream.write(text.encode("utf-8"))
+                    pending.extend(text)
                 if key is not None:
                     if key == "":
                         val = self._args_list.pop()
                     else:
                         val = self._args_dict[key]
                     if type(val) is bytes:
-                        self._out_stream.write(val)
+                        pending.extend(val)
                     elif type(val) in [str, int, float]:
-                        self._out_stream.write(
+                        pending.extend(
                             format(val, format_args if format_args else "")
                             .encode("utf-8", errors="surrogateescape")
                         )
@@ -120,6 +149,8 @@ class OutputFormatter:
                         assert key == "c"
                         self._found_stream = True
                         break
+            if pending:
+                self._out_stream.write(pending)
             if not self._found_stream:
                 break
 
@@ -128,35 +159,33 @@ class OutputFormatter:
         return False
 
 
-def dict_update_unless_none(current: dict[K, Any], updates: dict[K, Any]) -> None:
-    current.update({
-        k: v for k, v in updates.items() if v is not None
-    })
-
-
 def apply_general_format_args(
     doc: 'document.Document', mc: 'match_chain.MatchChain',
     args_dict: dict[str, Any], ci: Optional[int]
 ) -> None:
-    dict_update_unless_none(args_dict, {
-        "denc": doc.encoding,
-        "cesc": mc.content_escape_sequence,
-        "dl":   doc.path,
-        "chain": mc.chain_id,
-        "di": mc.di,
-        "ci": ci
-    })
+    # this runs for every formatted match, so we assign the keys directly
+    # instead of filtering a temporary dict for None values
+    if doc.encoding is not None:
+        args_dict["denc"] = doc.encoding
+    if mc.content_escape_sequence is not None:
+        args_dict["cesc"] = mc.content_escape_sequence
+    if doc.path is not None:
+        args_dict["dl"] = doc.path
+    if mc.chain_id is not None:
+        args_dict["chain"] = mc.chain_id
+    if mc.di is not None:
+        args_dict["di"] = mc.di
+    if ci is not None:
+        args_dict["ci"] = ci
 
 
 def apply_filename_format_args(filename: Optional[str], args_dict: dict[str, Any]) -> None:
     if filename is None:
         return
     b, e = os.path.splitext(filename)
-    args_dict.update({
-        "fn": filename,
-        "fb": b,
-        "fe": e,
-    })
+    args_dict["fn"] = filename
+    args_dict["fb"] = b
+    args_dict["fe"] = e
 
 
 def content_match_build_format_args(
@@ -169,7 +198,7 @@ def content_match_build_format_args(
     if content is not None:
         args_dict["c"] = content
 
-    for lm in [cm.doc.locator_match, cm.llm, cm.clm]:
+    for lm in (cm.doc.locator_match, cm.llm, cm.clm):
         if lm is not None:
             args_dict.update(lm.match_args)
 
@@ -195,8 +224,12 @@ def log(ctx: 'scr_context.ScrContext', verbosity: Verbosity, msg: str) -> None:
         log_raw(get_log_str(verbosity, msg))
 
 
-def get_format_string_keys(fmt_string: str) -> list[str]:
-    return [f for (_, f, _, _) in Formatter().parse(fmt_string) if f is not None]
+# the same format strings are inspected many times during setup
+# (once per chain, output format and key we look for), so we cache this.
+# returns a tuple so callers can't mutate the cached result
+@functools.lru_cache(maxsize=1024)
+def get_format_string_keys(fmt_string: str) -> tuple[str, ...]:
+    return tuple(f for (_, f, _, _) in FORMATTER.parse(fmt_string) if f is not None)
 
 
 def format_string_arg_occurence(fmt_string: Optional[str], arg_name: str) -> int:
@@ -272,7 +305,7 @@ def gen_default_format(mc: 'match_chain.MatchChain') -> str:
         form += f"{{chain:{len(str(mcc))}}}_"
 
     didigits = max(len(str(mc.dimin)), len(str(mc.dimax)))
-    cidigits = max(len(str(mc.dimin)), len(str(mc.dimax)))
+    cidigits = max(len(str(mc.cimin)), len(str(mc.cimax)))
     if mc.ci_continuous:
         form += f"{{ci:0{cidigits}}}"
     elif mc.loc_content.multimatch:
@@ -489,10 +522,7 @@ def load_cookie_jar(ctx: 'scr_context.ScrContext') -> None:
             ck['expiry'] = cookie.expires
         if cookie.path_specified:
             ck['path'] = cookie.path
-        if cookie.domain in ctx.cookie_dict:
-            ctx.cookie_dict[cookie.domain][cookie.name] = ck
-        else:
-            ctx.cookie_dict[cookie.domain] = {cookie.name: ck}
+        ctx.cookie_dict.setdefault(cookie.domain, {})[cookie.name] = ck
 
 
 def get_random_user_agent() -> UserAgent:
@@ -639,7 +669,7 @@ def parse_prompt_option(
 
 
 def parse_bool_string(val: str, default: Optional[bool] = None) -> Optional[bool]:
-    return parse_prompt_option(val, [(True, YES_INDICATING_STRINGS), (False, NO_INDICATING_STRINGS)], default)
+    return parse_prompt_option(val, BOOL_PROMPT_OPTIONS, default)
 
 
 def prompt(prompt_text: str, options: list[tuple[T, OptionIndicatingStrings]], default: Optional[T] = None) -> T:
@@ -655,7 +685,26 @@ def prompt(prompt_text: str, options: list[tuple[T, OptionIndicatingStrings]], d
 
 
 def prompt_yes_no(prompt_text: str, default: Optional[bool] = None) -> Optional[bool]:
-    return prompt(prompt_text, [(True, YES_INDICATING_STRINGS), (False, NO_INDICATING_STRINGS)], default)
+    return prompt(prompt_text, BOOL_PROMPT_OPTIONS, default)
+
+
+def input_until_escape_sequence(escape_sequence: str) -> str:
+    esc = "\n" + escape_sequence
+    lines: list[str] = []
+    searched_len = 0
+    carry = ""
+    while True:
+        line = input() + "\n"
+        lines.append(line)
+        # instead of searching the whole input for every new line,
+        # we only search the new one plus enough of the previous
+        # input to find escape sequences spanning the line break
+        haystack = carry + line
+        i = haystack.find(esc)
+        if i != -1:
+            return "".join(lines)[:searched_len - len(carry) + i]
+        searched_len += len(line)
+        carry = haystack[max(0, len(haystack) - len(esc) + 1):]
 
 
 def gen_dl_temp_name(
@@ -688,6 +737,29 @@ def fetch_file(ctx: 'scr_context.ScrContext', path: str, stream: bool = False) -
         raise ScrFetchError(utils.truncate(str(ex))) from ex
 
 
+def read_file_text(path: str, encoding: str) -> str:
+    # decoding straight from a memory map saves us from holding
+    # a bytes copy of the whole file next to the decoded text
+    try:
+        with open(path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # empty files and things like pipes can't be mapped
+                data: Union[bytes, mmap.mmap] = f.read()
+            else:
+                data = mm
+            try:
+                return str(data, encoding, "surrogateescape")
+            finally:
+                if isinstance(data, mmap.mmap):
+                    data.close()
+    except FileNotFoundError as ex:
+        raise ScrFetchError("no such file or directory") from ex
+    except IOError as ex:
+        raise ScrFetchError(utils.truncate(str(ex))) from ex
+
+
 def try_read_data_url(cm: 'content_match.ContentMatch') -> Optional[bytes]:
     assert cm.url_parsed is not None
     if cm.url_parsed.scheme == "data":
@@ -711,6 +783,41 @@ def request_exception_to_scr_fetch_error(ex: requests.exceptions.RequestExceptio
     return ScrFetchError("connection failed")
 
 
+def get_cookies_for_host(
+    cookie_dict: dict[str, dict[str, dict[str, Any]]], hostname: str
+) -> dict[str, str]:
+    # cookies are keyed by their domain, where a leading dot means
+    # that they also apply to subdomains (e.g. '.example.com').
+    # instead of testing every stored domain against the hostname,
+    # we look up the hostname and each of its parent domains directly.
+    # we go from the least to the most specific domain so that
+    # more specific cookies win
+    domains = []
+    labels = hostname.split(".")
+    for i in range(len(labels) - 1, 0, -1):
+        domains.append("." + ".".join(labels[i:]))
+    domains.append("." + hostname)
+    domains.append(hostname)
+    cookies: dict[str, str] = {}
+    for domain in domains:
+        domain_cookies = cookie_dict.get(domain)
+        if domain_cookies:
+            for name, ck in domain_cookies.items():
+                cookies[name] = ck["value"]
+    return cookies
+
+
+def get_requests_session() -> requests.Session:
+    session: Optional[requests.Session] = getattr(REQUESTS_SESSIONS, "session", None)
+    if session is None:
+        session = requests.Session()
+        # cookies set by a server must not leak into later requests,
+        # like they wouldn't with a plain requests.get
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        REQUESTS_SESSIONS.session = session
+    return session
+
+
 def request_raw(
     ctx: 'scr_context.ScrContext', path: str, path_parsed: urllib.parse.ParseResult,
     cookie_dict: Optional[dict[str, dict[str, dict[str, Any]]]] = None,
@@ -719,14 +826,11 @@ def request_raw(
     hostname = path_parsed.hostname if path_parsed.hostname else ""
     if cookie_dict is None:
         cookie_dict = ctx.cookie_dict
-    cookies = {
-        name: ck["value"]
-        for name, ck in cookie_dict.get(hostname, {}).items()
-    }
+    cookies = get_cookies_for_host(cookie_dict, hostname)
     assert ctx.user_agent is not None
     headers = {'User-Agent': ctx.user_agent}
 
-    res = requests.get(
+    res = get_requests_session().get(
         path, cookies=cookies, headers=headers, allow_redirects=True,
         proxies=proxies, timeout=ctx.request_timeout_seconds, stream=stream
     )
@@ -849,7 +953,7 @@ def insert_shadow_roots(
         return
     elem = elem[0]
     shadow_root_xml = cast(
-        lxml.html.HtmlElement, lxml.html.fromstring(inner_html)
+        lxml.html.HtmlElement, lxml.html.fromstring(inner_html, parser=get_html_parser())
     )
     for c in children:
         insert_shadow_roots(ctx, shadow_root_xml, c, True)
@@ -895,7 +999,7 @@ def expand_child_frames(
     frames: list[lxml.html.HtmlElement] = get_child_frames(doc_xml)
     if not frames:
         if roots_expanded:
-            text = cast(str, lxml.html.tostring(doc_xml))
+            text = cast(str, lxml.html.tostring(doc_xml, encoding="unicode"))
         return text, doc_xml
     depth = 0
     curr_xml = doc_xml
@@ -923,14 +1027,16 @@ def expand_child_frames(
             drv.switch_to.frame(iframe_sel)
             depth = depth_new
             frame_xml = cast(
-                lxml.html.HtmlElement, lxml.html.fromstring(drv.page_source)
+                lxml.html.HtmlElement, lxml.html.fromstring(
+                    drv.page_source, parser=get_html_parser()
+                )
             )
             expand_shadow_roots(ctx, frame_xml)
             frames = get_child_frames(frame_xml)
             curr_xml.append(frame_xml)
             curr_xml = frame_xml
 
-        return cast(str, lxml.html.tostring(doc_xml)), doc_xml
+        return cast(str, lxml.html.tostring(doc_xml, encoding="unicode")), doc_xml
     except SeleniumWebDriverException:
         # if the document fundamentally changes while we do this, we might
         # end up trying to focus on a deleted iframe
@@ -942,7 +1048,9 @@ def expand_child_frames(
 
 def selenium_get_full_page_source(ctx: 'scr_context.ScrContext') -> tuple[str, lxml.html.HtmlElement]:
     text = cast(SeleniumWebDriver, ctx.selenium_driver).page_source
-    doc_xml = cast(lxml.html.HtmlElement, lxml.html.fromstring(text))
+    doc_xml = cast(lxml.html.HtmlElement, lxml.html.fromstring(
+        text, parser=get_html_parser()
+    ))
     return expand_child_frames(ctx, text, doc_xml)
 
 
@@ -1011,9 +1119,8 @@ def fetch_doc(ctx: 'scr_context.ScrContext', doc: 'document.Document') -> None:
             ctx, Verbosity.INFO,
             f"reading {document_type_display_dict[doc.document_type]} '{doc.path}'"
         )
-        data = cast(bytes, fetch_file(ctx, doc.path, stream=False))
         encoding = doc.decide_encoding(ctx)
-        doc.text = data.decode(encoding, errors="surrogateescape")
+        doc.text = read_file_text(doc.path, encoding)
         return
     assert doc.document_type == DocumentType.URL
 
@@ -1021,9 +1128,15 @@ def fetch_doc(ctx: 'scr_context.ScrContext', doc: 'document.Document') -> None:
         ctx, Verbosity.INFO,
         f"downloading {document_type_display_dict[doc.document_type]} '{doc.path}'"
     )
-    data, encoding = cast(tuple[bytes, str], requests_dl(
-        ctx, doc.path, doc.path_parsed
-    ))
+    prefetch = doc.prefetch
+    doc.prefetch = None
+    # if the prefetch hasn't started yet we are faster doing it ourselves
+    if prefetch is not None and not prefetch.cancel():
+        data, encoding = cast(tuple[bytes, str], prefetch.result())
+    else:
+        data, encoding = cast(tuple[bytes, str], requests_dl(
+            ctx, doc.path, doc.path_parsed
+        ))
     if data is None:
         raise ScrFetchError("empty response")
     doc.encoding = encoding
@@ -1033,13 +1146,13 @@ def fetch_doc(ctx: 'scr_context.ScrContext', doc: 'document.Document') -> None:
 
 
 def gen_final_content_format(format_str: str, cm: 'content_match.ContentMatch') -> bytes:
-    with BytesIO(b"") as buf:
-        of = OutputFormatter(format_str, cm, buf, None)
-        while of.advance():
-            pass
-        buf.seek(0)
-        res = buf.read()
-    return res
+    # the formatter already batches its output into a single write,
+    # so we just collect it instead of going through a BytesIO
+    buf = download_job.ByteBuffer()
+    of = OutputFormatter(format_str, cm, buf, None)
+    while of.advance():
+        pass
+    return bytes(buf.to_bytes())
 
 
 def get_ci_di_context(cm: 'content_match.ContentMatch') -> str:
@@ -1065,6 +1178,15 @@ def forward_document(ctx: 'scr_context.ScrContext', doc: Optional['document.Docu
     ctx.docs.append(doc)
 
 
+def normalize_content_link(cm: 'content_match.ContentMatch') -> None:
+    cm.clm.result, cm.url_parsed = normalize_link(
+        cm.clm.result, cm.base, cm.doc.document_type.derived_link_type(),
+        cm.mc.default_document_scheme,
+        cm.mc.prefer_parent_document_scheme,
+        cm.mc.force_document_scheme, False
+    )
+
+
 def handle_content_match(cm: 'content_match.ContentMatch') -> InteractiveResult:
     cm.di = cm.mc.di
     cm.ci = cm.mc.ci
@@ -1082,30 +1204,21 @@ def handle_content_match(cm: 'content_match.ContentMatch') -> InteractiveResult:
         else:
             label_context = ""
 
-    while True:
-        if not cm.mc.content_raw:
-            cm.clm.result, cm.url_parsed = normalize_link(
-                cm.clm.result, cm.base, cm.doc.document_type.derived_link_type(),
-                cm.mc.default_document_scheme,
-                cm.mc.prefer_parent_document_scheme,
-                cm.mc.force_document_scheme, False
-            )
+    if cm.mc.content_raw:
+        prompt_options = INTERACTIVE_PROMPT_OPTIONS_WITH_INSPECT
+        inspect_opt_str = "/inspect"
+    else:
+        # the link only changes when the user edits it, so we only
+        # normalize it initially and after edits, not on every prompt
+        normalize_content_link(cm)
+        prompt_options = INTERACTIVE_PROMPT_OPTIONS
+        inspect_opt_str = ""
 
+    while True:
         if cm.mc.loc_content.interactive:
-            prompt_options = [
-                (InteractiveResult.ACCEPT, YES_INDICATING_STRINGS),
-                (InteractiveResult.REJECT, NO_INDICATING_STRINGS),
-                (InteractiveResult.EDIT, EDIT_INDICATING_STRINGS),
-                (InteractiveResult.SKIP_CHAIN, CHAIN_SKIP_INDICATING_STRINGS),
-                (InteractiveResult.SKIP_DOC, DOC_SKIP_INDICATING_STRINGS)
-            ]
             if cm.mc.content_raw:
-                prompt_options.append(
-                    (InteractiveResult.INSPECT, INSPECT_INDICATING_STRINGS))
-                inspect_opt_str = "/inspect"
                 prompt_msg = f'accept {content_type} from "{cm.doc.path}"{di_ci_context}{label_context}'
             else:
-                inspect_opt_str = ""
                 prompt_msg = f'"{cm.doc.path}"{di_ci_context}{label_context}: accept {content_type} "{cm.clm.result}"'
 
             res = prompt(
@@ -1123,17 +1236,13 @@ def handle_content_match(cm: 'content_match.ContentMatch') -> InteractiveResult:
                 return res
             if not cm.mc.content_raw:
                 cm.clm.result = input(f"enter new {content_type}:\n")
+                normalize_content_link(cm)
             else:
                 print(
                     f'enter new {content_type} (terminate with a newline followed by the string "{cm.mc.content_escape_sequence}"):\n')
-                cm.clm.result = ""
-                while True:
-                    cm.clm.result += input() + "\n"
-                    i = cm.clm.result.find(
-                        "\n" + cm.mc.content_escape_sequence)
-                    if i != -1:
-                        cm.clm.result = cm.clm.result[:i]
-                        break
+                cm.clm.result = input_until_escape_sequence(
+                    cm.mc.content_escape_sequence
+                )
         break
 
     job = download_job.DownloadJob(cm)
@@ -1158,13 +1267,7 @@ def handle_document_match(mc: 'match_chain.MatchChain', doc: 'document.Document'
     while True:
         res = prompt(
             f'accept matched document "{doc.path}" [Yes/no/edit]? ',
-            [
-                (InteractiveResult.ACCEPT, YES_INDICATING_STRINGS),
-                (InteractiveResult.REJECT, NO_INDICATING_STRINGS),
-                (InteractiveResult.EDIT, EDIT_INDICATING_STRINGS),
-                (InteractiveResult.SKIP_CHAIN, CHAIN_SKIP_INDICATING_STRINGS),
-                (InteractiveResult.SKIP_DOC, DOC_SKIP_INDICATING_STRINGS)
-            ],
+            INTERACTIVE_PROMPT_OPTIONS,
             InteractiveResult.ACCEPT
         )
         if res == InteractiveResult.EDIT:
@@ -1179,60 +1282,72 @@ def gen_content_matches(
     # TODO: properly set content match base respecting iframes
     text = cast(str, doc.text)
     content_matches: list[content_match.ContentMatch] = []
-    content_lms_xp: list[locator.LocatorMatch] = mc.loc_content.match_xpath(
+    loc_label = mc.loc_label
+    loc_content = mc.loc_content
+    # these don't change while we process a document,
+    # so we avoid looking them up again for every match
+    labels_inside_content = mc.labels_inside_content
+    label_xpath = loc_label.xpath
+    have_content_and_label_xpath = bool(label_xpath and loc_content.xpath)
+    label_multimatch = loc_label.multimatch
+    label_allow_missing = mc.label_allow_missing
+
+    content_lms_xp: list[locator.LocatorMatch] = loc_content.match_xpath(
         text, doc.xml, mc.has_content_xpaths
     )
     label_lms: list[locator.LocatorMatch] = []
-    if mc.has_label_matching and not mc.labels_inside_content:
-        label_lms = mc.loc_label.match_xpath(text, doc.xml, False)
-        label_lms = mc.loc_label.apply_regex_matches(label_lms)
-        label_lms = mc.loc_label.apply_js_matches(doc, mc, label_lms)
+    if mc.has_label_matching and not labels_inside_content:
+        label_lms = loc_label.match_xpath(text, doc.xml, False)
+        label_lms = loc_label.apply_regex_matches(label_lms)
+        label_lms = loc_label.apply_js_matches(doc, mc, label_lms)
     match_index = 0
     labels_none_for_n = 0
     for clm_xp in content_lms_xp:
-        if mc.labels_inside_content and mc.loc_label.xpath and mc.loc_content.xpath:
-            label_lms = mc.loc_label.match_xpath(
+        if labels_inside_content and have_content_and_label_xpath:
+            label_lms = loc_label.match_xpath(
                 clm_xp.result, clm_xp.xmatch_xml, False
             )
             # in case we have label xpath matching, the label regex matching
             # will be done on the LABEL xpath result, not the content one
             # even for lic = y
-            label_lms = mc.loc_label.apply_regex_matches(label_lms)
-            label_lms = mc.loc_label.apply_js_matches(doc, mc, label_lms)
+            label_lms = loc_label.apply_regex_matches(label_lms)
+            label_lms = loc_label.apply_js_matches(doc, mc, label_lms)
 
-        content_lms = mc.loc_content.apply_regex_matches([clm_xp])
-        content_lms = mc.loc_content.apply_js_matches(doc, mc, content_lms)
+        content_lms = loc_content.apply_regex_matches([clm_xp])
+        content_lms = loc_content.apply_js_matches(doc, mc, content_lms)
         for clm in content_lms:
             llm: Optional[locator.LocatorMatch] = None
-            if mc.labels_inside_content:
-                if not mc.loc_label.xpath or not mc.loc_content.xpath:
+            if labels_inside_content:
+                if not have_content_and_label_xpath:
                     llm = locator.LocatorMatch()
                     llm.result = clm.result
-                    if mc.loc_label.xpath:
+                    if label_xpath:
                         try:
-                            res_xml = cast(lxml.html.HtmlElement, lxml.html.fromstring(clm.result))
-                            label_lms = mc.loc_label.match_xpath(clm.result, res_xml)
+                            res_xml = cast(lxml.html.HtmlElement, lxml.html.fromstring(
+                                clm.result, parser=get_html_parser()
+                            ))
+                            label_lms = loc_label.match_xpath(clm.result, res_xml)
                         except lxml.etree.LxmlError:
                             label_lms = []
                     else:
                         label_lms = [llm]
 
-                    label_lms = mc.loc_label.apply_regex_matches(label_lms, False)
-                    label_lms = mc.loc_label.apply_js_matches(
+                    label_lms = loc_label.apply_regex_matches(label_lms, False)
+                    label_lms = loc_label.apply_js_matches(
                         doc, mc, label_lms, False
                     )
                 if len(label_lms) == 0:
-                    if not mc.label_allow_missing:
+                    if not label_allow_missing:
                         labels_none_for_n += 1
                         continue
                 else:
                     llm = label_lms[0]
             else:
-                if not mc.loc_label.multimatch and len(label_lms) > 0:
+                if not label_multimatch and len(label_lms) > 0:
                     llm = label_lms[0]
                 elif match_index < len(label_lms):
                     llm = label_lms[match_index]
-                elif not mc.label_allow_missing:
+                elif not label_allow_missing:
                     labels_none_for_n += 1
                     continue
                 else:
@@ -1254,9 +1369,9 @@ def gen_document_matches(
     )
     document_lms = mc.loc_document.apply_regex_matches(document_lms)
     document_lms = mc.loc_document.apply_js_matches(doc, mc, document_lms)
+    link_type = doc.document_type.derived_link_type()
     for dlm in document_lms:
         mc.loc_document.apply_format_for_document_match(doc, mc, dlm)
-        link_type = doc.document_type.derived_link_type()
         path, path_parsed = normalize_link(
             dlm.result, doc.base, link_type, mc.default_document_scheme,
             mc.prefer_parent_document_scheme,
@@ -1347,7 +1462,7 @@ def handle_interactive_chains(
         if docs_count != 1:
             msg += "s"
         else:
-            msg += "s"
+            msg += " "
     msg += " [Yes/skip]? "
 
     if msg != last_msg:
@@ -1358,9 +1473,11 @@ def handle_interactive_chains(
     else:
         msg_full = None
 
+    # only peek at stdin before redrawing the prompt, the actual
+    # waiting is done once below instead of twice per poll
     user_answered = False
     if try_number > 1:
-        user_answered = utils.stdin_has_content(ctx.selenium_poll_frequency_secs)
+        user_answered = utils.stdin_has_content(0)
 
     if not user_answered and msg_full:
         sys.stdout.write(msg_full)
@@ -1372,19 +1489,7 @@ def handle_interactive_chains(
     if user_answered:
         result = parse_prompt_option(
             sys.stdin.readline(),
-            [
-                (InteractiveResult.ACCEPT, YES_INDICATING_STRINGS),
-                (
-                    InteractiveResult.SKIP_DOC,
-                    OptionIndicatingStrings(
-                        "skip",
-                        set_join(
-                            SKIP_INDICATING_STRINGS.matching,
-                            NO_INDICATING_STRINGS.matching
-                        )
-                    )
-                )
-            ],
+            PAGE_PROMPT_OPTIONS,
             InteractiveResult.ACCEPT
         )
         if result is None:
@@ -1400,12 +1505,9 @@ def match_chain_was_satisfied(mc: 'match_chain.MatchChain') -> tuple[bool, bool]
     if not mc.ctx.selenium_variant.enabled() or mc.selenium_strategy is SeleniumStrategy.PLAIN:
         satisfied = True
     elif mc.selenium_strategy == SeleniumStrategy.ANYMATCH:
-        if mc.need_content_matches():
-            if mc.content_matches:
-                satisfied = True
-        if mc.need_document_matches(True):
-            if mc.document_matches:
-                satisfied = True
+        # handle_match_chain already left these empty
+        # for whatever the chain didn't need
+        satisfied = bool(mc.content_matches or mc.document_matches)
     else:
         assert mc.selenium_strategy in [
             SeleniumStrategy.INTERACTIVE, SeleniumStrategy.DEDUP
@@ -1441,7 +1543,7 @@ def handle_match_chain(mc: 'match_chain.MatchChain', doc: 'document.Document') -
         for dm in document_matches:
             if dm in mc.handled_document_matches:
                 continue
-            cm.mc.handled_document_matches.add(dm)
+            mc.handled_document_matches.add(dm)
             mc.document_matches.append(dm)
 
 
@@ -1507,7 +1609,7 @@ def normalize_link(
 ) -> tuple[str, urllib.parse.ParseResult]:
     link = link.strip()
     if link.startswith("data:"):
-        return link, urllib.parse.urlparse(link)
+        return link, utils.urlparse_cached(link)
     if link_type == DocumentType.FILE:
         assert base is not None
         if link.startswith("file:"):
@@ -1520,10 +1622,29 @@ def normalize_link(
                 link = os.path.normpath(os.path.join(base.path, link))
         else:
             link = os.path.normpath(link)
-        return link, urllib.parse.urlparse("file:" + link)._replace(scheme="")
+        return link, utils.urlparse_cached("file:" + link)._replace(scheme="")
     assert link_type == DocumentType.URL
+    return normalize_url_link(
+        link, base, default_scheme, prefer_parent_scheme,
+        force_default_scheme, prefer_parsing_as_absolute_url
+    )
+
+
+# links tend to show up repeatedly (as content and document matches, across
+# documents of the same site, after declining an interactive prompt, ...).
+# all arguments and results are immutable, so we can memoize this.
+# file links are not cached since they depend on the working directory
+@functools.lru_cache(maxsize=4096)
+def normalize_url_link(
+    link: str,
+    base: Optional[urllib.parse.ParseResult],
+    default_scheme: str,
+    prefer_parent_scheme: bool,
+    force_default_scheme: bool,
+    prefer_parsing_as_absolute_url: bool,
+) -> tuple[str, urllib.parse.ParseResult]:
     changed = False
-    link_parsed = urllib.parse.urlparse(link)
+    link_parsed = utils.urlparse_cached(link)
 
     scheme_was_blank = link_parsed.scheme == ""
     if scheme_was_blank:
@@ -1536,6 +1657,15 @@ def normalize_link(
         link_parsed = link_parsed._replace(
             scheme=scheme
         )
+        # scheme relative links like '//example.com/foo' only lack the scheme,
+        # so we can prepend it instead of rebuilding the whole url.
+        # we leave links with (potentially blank) query, params or fragment
+        # to urlunparse, which normalizes those
+        if (
+            link.startswith("//") and link_parsed.netloc != ""
+            and not any(c in link for c in "?;#")
+        ):
+            return scheme + ":" + link, link_parsed
         changed = True
 
     # for urls like 'google.com' urllib makes this a path instead of a netloc
@@ -1568,24 +1698,87 @@ def normalize_link(
     return link, link_parsed
 
 
+@functools.lru_cache(maxsize=None)
+def get_html_parser(encoding: Optional[str] = None) -> lxml.html.HTMLParser:
+    # huge_tree lifts libxml2's limits on tree depth and text node size,
+    # which very large documents would otherwise run into
+    return lxml.html.HTMLParser(encoding=encoding, huge_tree=True)
+
+
 def parse_xml(ctx: 'scr_context.ScrContext', doc: 'document.Document') -> None:
     try:
         text = cast(str, doc.text)
-        if text.strip() == "":
+        # unlike strip(), isspace() stops at the first real character
+        # instead of copying the whole document
+        if not text or text.isspace():
             src_xml = lxml.html.Element("html")
         elif doc.forced_encoding:
             src_bytes = text.encode(cast(str, doc.encoding), errors="surrogateescape")
             src_xml = cast(lxml.html.HtmlElement, lxml.html.fromstring(
-                src_bytes,
-                parser=lxml.html.HTMLParser(encoding=doc.encoding)
+                src_bytes, parser=get_html_parser(doc.encoding)
             ))
         else:
-            src_xml = cast(lxml.html.HtmlElement, lxml.html.fromstring(text))
+            src_xml = cast(lxml.html.HtmlElement, lxml.html.fromstring(
+                text, parser=get_html_parser()
+            ))
         doc.xml = src_xml
     except (lxml.etree.LxmlError, UnicodeEncodeError, UnicodeDecodeError) as ex:
         log(ctx, Verbosity.ERROR, f"{doc.path}: failed to parse as xml: {str(ex)}")
 
 
+def prefetch_document(
+    ctx: 'scr_context.ScrContext', path: str,
+    path_parsed: urllib.parse.ParseResult, delay: float
+) -> tuple[Union['download_job.MinimalInputStream', bytes, None], Optional[str]]:
+    if delay:
+        time.sleep(delay)
+    return requests_dl(ctx, path, path_parsed)
+
+
+def prefetch_documents(ctx: 'scr_context.ScrContext') -> None:
+    # download the next few url documents in the background
+    # so their network round trips overlap with the processing of the
+    # current one. the prefetch doesn't log, fetch_doc does that
+    # once the document is used
+    if ctx.dl_manager is None or ctx.selenium_variant.enabled():
+        return
+    queued_docs = list(itertools.islice(ctx.docs, ctx.dl_manager.max_threads))
+    # to stay polite we never have more than one prefetch per host in flight
+    busy_hosts = {
+        cast(urllib.parse.ParseResult, doc.path_parsed).netloc
+        for doc in queued_docs
+        if doc.prefetch is not None and not doc.prefetch.done()
+    }
+    delay = 0.0
+    for doc in queued_docs:
+        if (
+            doc.prefetch is not None
+            or doc.document_type != DocumentType.URL
+            or doc is ctx.reused_doc
+        ):
+            continue
+        assert doc.path is not None
+        assert doc.path_parsed is not None
+        if doc.path_parsed.netloc in busy_hosts:
+            continue
+        # with a cimax / dimax, processing the current document
+        # might make this one unnecessary, so we don't speculate
+        if any(
+            mc.cimax != float("inf") or mc.dimax != float("inf")
+            for mc in doc.match_chains
+        ):
+            continue
+        if any(
+            mc.need_document_matches(False) or mc.need_content_matches()
+            for mc in doc.match_chains
+        ):
+            busy_hosts.add(doc.path_parsed.netloc)
+            doc.prefetch = ctx.dl_manager.document_prefetch_executor.submit(
+                prefetch_document, ctx, doc.path, doc.path_parsed, delay
+            )
+            delay += DOCUMENT_PREFETCH_STAGGER_SECONDS
+
+
 def process_document_queue(ctx: 'scr_context.ScrContext') -> Optional['document.Document']:
     doc = None
     while ctx.docs:
@@ -1601,6 +1794,9 @@ def process_document_queue(ctx: 'scr_context.ScrContext') -> Optional['document.
                     have_xpath_matching += 1
         if unsatisfied_chains == 0:
             if not ctx.selenium_variant.enabled() or (doc is ctx.reused_doc and not ctx.changed_selenium):
+                if doc.prefetch is not None:
+                    doc.prefetch.cancel()
+                    doc.prefetch = None
                 continue
 
         try_number = 0
@@ -1616,6 +1812,9 @@ def process_document_queue(ctx: 'scr_context.ScrContext') -> Optional['document.
         except ScrFetchError as ex:
             log(ctx, Verbosity.ERROR, f"Failed to fetch {doc.path}: {str(ex)}")
             continue
+        # we only prefetch once the current document is fetched,
+        # so its host never gets two concurrent requests from us
+        prefetch_documents(ctx)
         static_content = (
             doc.document_type != DocumentType.URL
             or not ctx.selenium_variant.enabled()
@@ -1698,10 +1897,12 @@ def process_document_queue(ctx: 'scr_context.ScrContext') -> Optional['document.
             content_skip_doc, doc_skip_doc = accept_for_match_chain(
                 mc, doc, content_skip_doc, doc_skip_doc, new_docs
             )
-        if mc.ctx.documents_bfs:
-            mc.ctx.docs.extend(new_docs)
+        # deque.extendleft is O(len(new_docs)) and doesn't move existing
+        # entries, so DFS order is just as cheap as BFS order here
+        if ctx.documents_bfs:
+            ctx.docs.extend(new_docs)
         else:
-            mc.ctx.docs.extendleft(reversed(new_docs))
+            ctx.docs.extendleft(reversed(new_docs))
     return doc
 
 
@@ -1734,6 +1935,8 @@ def finalize(ctx: 'scr_context.ScrContext') -> None:
             shutil.rmtree(ctx.downloads_temp_dir)
         finally:
             ctx.downloads_temp_dir = None
+    utils.urlparse_cached.cache_clear()
+    normalize_url_link.cache_clear()
     success = True
 
 
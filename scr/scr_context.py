@@ -67,5 +67,3 @@ class ScrContext(ConfigDataClass):
         self.docs = deque()
         self.defaults_mc = match_chain.MatchChain(self, -1)
         self.origin_mc = match_chain.MatchChain(self, -1, blank=True)
-        # turn ctx to none temporarily for origin so it can be deepcopied
-        self.origin_mc.ctx = None  # type: ignore
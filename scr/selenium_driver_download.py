@@ -4,8 +4,6 @@ from .definitions import (
 )
 from . import scr, utils, scr_context, windows
 from typing import Optional, cast
-import selenium_driver_updater
-import selenium_driver_updater.util.exceptions
 import os
 import glob
 import shutil
@@ -141,6 +139,9 @@ def get_preferred_selenium_driver_path(variant: 'SeleniumVariant') -> str:
 
 
 def install_selenium_driver(ctx: 'scr_context.ScrContext', variant: 'SeleniumVariant', update: bool) -> None:
+    # this library is heavy to import and only needed for selinstall/selupdate
+    import selenium_driver_updater
+    import selenium_driver_updater.util.exceptions
     if variant == SeleniumVariant.CHROME:
         driver_name = selenium_driver_updater.DriverUpdater.chromedriver
     elif variant in [SeleniumVariant.FIREFOX, SeleniumVariant.TORBROWSER]:
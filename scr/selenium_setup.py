@@ -2,7 +2,6 @@ from selenium.webdriver.firefox.service import Service as SeleniumFirefoxService
 from selenium.webdriver.chrome.service import Service as SeleniumChromeService
 from selenium.common.exceptions import WebDriverException as SeleniumWebDriverException
 from selenium.common.exceptions import TimeoutException as SeleniumTimeoutException
-from tbselenium.tbdriver import TorBrowserDriver
 import selenium.webdriver
 import mimetypes
 import functools
@@ -27,12 +26,18 @@ def load_selenium_cookies(ctx: 'scr_context.ScrContext') -> dict[str, dict[str,
     ] = ctx.selenium_driver.get_cookies()  # type: ignore
     cookie_dict: dict[str, dict[str, dict[str, Any]]] = {}
     for ck in cookies:
-        if cast(str, ck["domain"]) not in cookie_dict:
-            cookie_dict[ck["domain"]] = {}
-        cookie_dict[ck["domain"]][ck["name"]] = ck
+        cookie_dict.setdefault(cast(str, ck["domain"]), {})[ck["name"]] = ck
     return cookie_dict
 
 
+@functools.lru_cache(maxsize=None)
+def get_save_mimetypes() -> str:
+    # the mimetypes database doesn't change at runtime, so we only
+    # build this once instead of on every browser (re)start
+    mimetypes.init()
+    return ";".join(set(mimetypes.types_map.values()))
+
+
 def selenium_build_firefox_options(
     ctx: 'scr_context.ScrContext'
 ) -> selenium.webdriver.FirefoxOptions:
@@ -48,8 +53,7 @@ def selenium_build_firefox_options(
     prefs = {}
     # setup download dir and disable save path popup
     if ctx.downloads_temp_dir is not None:
-        mimetypes.init()
-        save_mimetypes = ";".join(set(mimetypes.types_map.values()))
+        save_mimetypes = get_save_mimetypes()
         prefs.update({
             "browser.download.dir": ctx.downloads_temp_dir,
             "browser.download.useDownloadDir": True,
@@ -83,6 +87,8 @@ def setup_selenium_tor(ctx: 'scr_context.ScrContext') -> None:
             ctx.tor_browser_dir = os.environ[tb_env_var]
         else:
             raise ScrSetupError("no tbdir specified, check --help")
+    # tbselenium is only needed for this variant, so we import it lazily
+    from tbselenium.tbdriver import TorBrowserDriver
     try:
         ctx.selenium_driver = TorBrowserDriver(
             ctx.tor_browser_dir, tbb_logfile_path=ctx.selenium_log_path,
@@ -171,12 +177,26 @@ def selenium_add_cookies_through_get(ctx: 'scr_context.ScrContext') -> None:
         except SeleniumTimeoutException:
             scr.log(
                 ctx, Verbosity.WARN,
-                "Failed to apply cookies for https://{domain}: page failed to load"
+                f"Failed to apply cookies for https://{domain}: page failed to load"
             )
         for c in cookies.values():
             ctx.selenium_driver.add_cookie(c)
 
 
+def selenium_add_cookies_through_cdp(ctx: 'scr_context.ScrContext') -> None:
+    # chromium lets us set all cookies in a single devtools call,
+    # instead of loading a page for every domain and adding them one by one
+    cookies = []
+    for domain_cookies in ctx.cookie_dict.values():
+        for ck in domain_cookies.values():
+            cdp_cookie = {k: v for k, v in ck.items() if k != "expiry"}
+            if "expiry" in ck:
+                cdp_cookie["expires"] = ck["expiry"]
+            cookies.append(cdp_cookie)
+    drv = cast(selenium.webdriver.Chrome, ctx.selenium_driver)
+    drv.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+
+
 def selenium_start_wrapper(*args: Any, **kwargs: Any) -> None:
     original_p_open = subprocess.Popen
     if sys.platform == "win32":
@@ -260,6 +280,9 @@ def setup_selenium(ctx: 'scr_context.ScrContext') -> None:
 
     ctx.selenium_driver.set_page_load_timeout(ctx.request_timeout_seconds)
     if ctx.cookie_jar:
-        # todo: implement something more clever for this, at least for chrome:
-        # https://stackoverflow.com/questions/63220248/how-to-preload-cookies-before-first-request-with-python3-selenium-chrome-webdri
-        selenium_add_cookies_through_get(ctx)
+        if ctx.selenium_variant == SeleniumVariant.CHROME:
+            selenium_add_cookies_through_cdp(ctx)
+        else:
+            # todo: implement something more clever for this
+            # https://stackoverflow.com/questions/63220248/how-to-preload-cookies-before-first-request-with-python3-selenium-chrome-webdri
+            selenium_add_cookies_through_get(ctx)
@@ -0,0 +1,71 @@
+import os
+import pathlib
+from ..download_job import BrowserDownloadWatcher, SELENIUM_EMPTY_DOWNLOAD_SETTLE_SECONDS
+
+
+def write_file(path: str, content: bytes = b"") -> None:
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def test_firefox_download(tmp_path: pathlib.Path) -> None:
+    target = str(tmp_path / "dl0.bin")
+    watcher = BrowserDownloadWatcher(target)
+    assert not watcher.poll(0)
+    assert not watcher.started
+    # firefox creates the empty target first, and the '.part' file
+    # right after, so we must not mistake the empty target for the result
+    write_file(target)
+    assert not watcher.poll(0.01)
+    assert watcher.started
+    assert not watcher.poll(0.02)
+    write_file(target + ".part", b"foo")
+    assert not watcher.poll(0.03)
+    os.replace(target + ".part", target)
+    assert watcher.poll(0.04)
+
+
+def test_firefox_download_between_renames(tmp_path: pathlib.Path) -> None:
+    target = str(tmp_path / "dl0.bin")
+    watcher = BrowserDownloadWatcher(target)
+    write_file(target)
+    write_file(target + ".part", b"foo")
+    assert not watcher.poll(0)
+    # the '.part' file is gone but the target was removed as well
+    os.remove(target)
+    os.remove(target + ".part")
+    assert not watcher.poll(0.01)
+    write_file(target, b"foo")
+    assert watcher.poll(0.02)
+
+
+def test_chrome_download(tmp_path: pathlib.Path) -> None:
+    target = str(tmp_path / "dl0.bin")
+    watcher = BrowserDownloadWatcher(target)
+    assert not watcher.poll(0)
+    write_file(target + ".crdownload", b"fo")
+    assert not watcher.poll(0.01)
+    assert watcher.started
+    write_file(target + ".crdownload", b"foo")
+    assert not watcher.poll(0.02)
+    os.replace(target + ".crdownload", target)
+    assert watcher.poll(0.03)
+
+
+def test_download_without_known_partial_file(tmp_path: pathlib.Path) -> None:
+    target = str(tmp_path / "dl0.bin")
+    watcher = BrowserDownloadWatcher(target)
+    write_file(target, b"fo")
+    assert not watcher.poll(0)
+    write_file(target, b"foo")
+    assert not watcher.poll(0.01)
+    assert watcher.poll(0.02)
+
+
+def test_empty_download(tmp_path: pathlib.Path) -> None:
+    target = str(tmp_path / "dl0.bin")
+    watcher = BrowserDownloadWatcher(target)
+    write_file(target)
+    assert not watcher.poll(0)
+    assert not watcher.poll(SELENIUM_EMPTY_DOWNLOAD_SETTLE_SECONDS / 2)
+    assert watcher.poll(SELENIUM_EMPTY_DOWNLOAD_SETTLE_SECONDS)
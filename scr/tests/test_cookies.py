@@ -0,0 +1,35 @@
+from typing import Any
+from ..scr import get_cookies_for_host
+
+
+def make_cookie_dict(*cookies: tuple[str, str, str]) -> dict[str, dict[str, dict[str, Any]]]:
+    cookie_dict: dict[str, dict[str, dict[str, Any]]] = {}
+    for domain, name, value in cookies:
+        cookie_dict.setdefault(domain, {})[name] = {
+            "domain": domain, "name": name, "value": value
+        }
+    return cookie_dict
+
+
+def test_cookies_for_subdomains() -> None:
+    cookie_dict = make_cookie_dict(
+        (".example.com", "a", "parent"),
+        ("example.com", "b", "exact"),
+        ("www.example.com", "c", "www"),
+        ("other.com", "d", "other"),
+    )
+    assert get_cookies_for_host(cookie_dict, "www.example.com") == {
+        "a": "parent", "c": "www"
+    }
+    assert get_cookies_for_host(cookie_dict, "example.com") == {
+        "a": "parent", "b": "exact"
+    }
+    assert get_cookies_for_host(cookie_dict, "") == {}
+
+
+def test_more_specific_cookies_win() -> None:
+    cookie_dict = make_cookie_dict(
+        (".example.com", "a", "parent"),
+        ("www.example.com", "a", "www"),
+    )
+    assert get_cookies_for_host(cookie_dict, "www.example.com") == {"a": "www"}
@@ -0,0 +1,53 @@
+import itertools
+import pytest
+from ..scr import input_until_escape_sequence
+from .utils import validate_text
+
+
+def input_until_escape_sequence_reference(lines: list[str], escape_sequence: str) -> str:
+    # searches the whole input after every line, like the original implementation
+    text = ""
+    for line in lines:
+        text += line + "\n"
+        i = text.find("\n" + escape_sequence)
+        if i != -1:
+            return text[:i]
+    raise ValueError("escape sequence was never entered")
+
+
+def feed_input(monkeypatch: pytest.MonkeyPatch, lines: list[str]) -> None:
+    it = iter(lines)
+    monkeypatch.setattr("builtins.input", lambda *args: next(it))
+
+
+@pytest.mark.parametrize(('lines', 'escape_sequence', 'expected'), [
+    (["foo", "bar", "EOF"], "EOF", "foo\nbar"),
+    (["", "a", "", "b"], "a\n\nb", ""),
+    (["x", "a", "", "b"], "a\n\nb", "x"),
+    (["", "", "a", "b", "c"], "a\nb\nc", "\n"),
+    (["foo", ""], "", "foo"),
+])
+def test_escape_sequence_spanning_short_lines(
+    monkeypatch: pytest.MonkeyPatch, lines: list[str], escape_sequence: str, expected: str
+) -> None:
+    feed_input(monkeypatch, lines)
+    validate_text(
+        "wrong input result", expected,
+        input_until_escape_sequence(escape_sequence), add_newline=True
+    )
+
+
+def test_matches_full_input_search(monkeypatch: pytest.MonkeyPatch) -> None:
+    escape_sequences = ["", "a", "ab", "a\nb", "a\n\nb", "\na", "a\n"]
+    line_choices = ["", "a", "b", "ab", "ba"]
+    for escape_sequence in escape_sequences:
+        for line_count in range(1, 5):
+            for lines in itertools.product(line_choices, repeat=line_count):
+                # make sure the sequence is eventually terminated
+                all_lines = [*lines, *escape_sequence.split("\n")]
+                feed_input(monkeypatch, all_lines)
+                validate_text(
+                    f"wrong input result for {all_lines} with escape sequence {escape_sequence!r}",
+                    input_until_escape_sequence_reference(all_lines, escape_sequence),
+                    input_until_escape_sequence(escape_sequence), add_newline=True
+                )
@@ -1,4 +1,6 @@
 import inspect
+import functools
+import urllib.parse
 from . import windows
 from typing import Optional, Callable
 import platform
@@ -40,12 +42,6 @@ def not_none(val: Optional[T]) -> T:
     return val
 
 
-def empty_string_to_none(string: Optional[str]) -> Optional[str]:
-    if string == "":
-        return None
-    return string
-
-
 def choose_first_not_none(*tries: Callable[[], Optional[T]]) -> Optional[T]:
     for t in tries:
         res = t()
@@ -63,6 +59,13 @@ def unique_not_none(*values: Optional[T]) -> list[T]:
     return list(res)
 
 
+@functools.lru_cache(maxsize=1024)
+def urlparse_cached(url: str) -> urllib.parse.ParseResult:
+    # ParseResult is an immutable namedtuple, so sharing results is fine.
+    # crawls tend to see the same links and document urls over and over
+    return urllib.parse.urlparse(url)
+
+
 def stdin_has_content(timeout: float) -> bool:
     assert timeout >= 0
     if is_windows():
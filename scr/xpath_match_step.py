@@ -4,25 +4,42 @@ from .utils import not_none
 from typing import cast, Optional, Any, OrderedDict
 import lxml.etree
 import lxml.html
+import re
+import functools
+
+# xpaths like '//li' that just select all elements of a tag
+SIMPLE_DESCENDANT_XPATH_REGEX = re.compile(r"^\s*//([A-Za-z_][\w.\-]*)\s*$")
+
+# dummy document that xpaths are evaluated against once during setup
+# to catch errors that compiling alone doesn't report
+XPATH_VALIDATION_DOC = lxml.html.fromstring("<div>test</div>")
+
+
+@functools.lru_cache(maxsize=256)
+def get_unicode_result_xpath(xpath_str: str, attrname: Optional[str]) -> lxml.etree.XPath:
+    # since lxml doesn't allow us to evaluate xpaths on unicode results,
+    # but we need it e.g. for lic, we hack in support for it by
+    # generating a derived xpath that gets the expected results while
+    # actually being evaluated on the parent.
+    # this is evaluated for every content match, so we compile each
+    # derived xpath only once
+    if attrname is None:
+        fixed_xpath = "./text()"
+    else:
+        fixed_xpath = f"./@{attrname}"
+
+    if xpath_str[0:1] != "/":
+        fixed_xpath += "/"
+    fixed_xpath += xpath_str
+    return lxml.etree.XPath(fixed_xpath)
 
 
 def eval_xpath(xpath: lxml.etree.XPath, src_xml: lxml.html.HtmlElement) -> Any:
     if type(src_xml) == lxml.etree._ElementUnicodeResult:  # type: ignore
-        # since lxml doesn't allow us to evaluate xpaths on these,
-        # but we need it e.g. for lic, we hack in support for it by
-        # generating a derived xpath that gets the expected results while
-        # actually being evaluated on the parent
-        if src_xml.attrname is None:
-            fixed_xpath = "./text()"
-        else:
-            fixed_xpath = f"./@{src_xml.attrname}"
-
-        if xpath.path[0:1] != "/":
-            fixed_xpath += "/"
-        fixed_xpath += xpath.path
-        return src_xml.getparent().xpath(fixed_xpath)
+        fixed_xpath = get_unicode_result_xpath(xpath.path, src_xml.attrname)
+        return fixed_xpath(src_xml.getparent())
     else:
-        return xpath.evaluate(src_xml)  # type: ignore
+        return xpath(src_xml)
 
 
 def build_sibling_xpath(root: lxml.html.HtmlElement, elem: lxml.html.HtmlElement, sibling_depth: int) -> lxml.etree.XPath:
@@ -83,6 +100,8 @@ class XPathMatchStep(MatchStep):
         MatchStep._annotations_as_config_slots(__annotations__, [])
     )
     xpath: lxml.etree.XPath
+    # set for simple '//tag' xpaths that we can answer by iterating the tree
+    simple_descendant_tag: Optional[str] = None
     store_xml: bool
     step_type_index: int
 
@@ -92,16 +111,23 @@ class XPathMatchStep(MatchStep):
     def setup(self, loc: 'Locator', prev: Optional['MatchStep']) -> None:
         try:
             xp = lxml.etree.XPath(self.arg_val)
-            xp.evaluate(  # type: ignore
-                lxml.html.fromstring("<div>test</div>")
-            )
+            xp(XPATH_VALIDATION_DOC)
         except (lxml.etree.XPathError):
             # don't use the XPathSyntaxError message because they are spectacularily bad
             # e.g. XPath("/div/text(") -> XPathSyntaxError("Missing closing CURLY BRACE")
             raise ScrSetupError(
-                f"invalid xpath in {self.get_configuring_argument(['xpath'])}"
+                f"invalid xpath in {self.get_configuring_argument(['arg_val'])}"
             )
         self.xpath = xp
+        simple_match = SIMPLE_DESCENDANT_XPATH_REGEX.match(self.arg_val)
+        self.simple_descendant_tag = simple_match[1] if simple_match else None
+        # keeping the matched elements around is only necessary if
+        # further xpaths are evaluated on them, e.g. for lic
+        following_steps = loc.match_steps[loc.match_steps.index(self) + 1:]
+        self.store_xml = (
+            any(ms.needs_xml() for ms in following_steps)
+            or (loc is loc.mc.loc_content and bool(loc.mc.labels_inside_content))
+        )
 
     def apply(self, lms: list[LocatorMatch]) -> list[LocatorMatch]:
         err = False
@@ -109,16 +135,24 @@ class XPathMatchStep(MatchStep):
         for lm in lms:
             src_xml = not_none(lm.xml)
             try:
-                xpath_matches = eval_xpath(self.xpath, src_xml)
+                if (
+                    self.simple_descendant_tag is not None
+                    and type(src_xml) is not lxml.etree._ElementUnicodeResult  # type: ignore
+                ):
+                    # a filtered tree walk yields the same elements in document order
+                    # but skips the setup and result conversion of the xpath engine
+                    xpath_matches = list(src_xml.getroottree().iter(self.simple_descendant_tag))
+                else:
+                    xpath_matches = eval_xpath(self.xpath, src_xml)
             except (lxml.etree.XPathError, lxml.etree.LxmlError):
                 err = True
             if err or not isinstance(xpath_matches, list):
                 raise ScrMatchError(
-                    f"xpath matching failed for: {self.get_configuring_argument(['xpath'])}"
+                    f"xpath matching failed for: {self.get_configuring_argument(['arg_val'])}"
                 )
 
             if len(xpath_matches) > 1 and not self.multimatch:
-                xpath_matches = xpath_matches[:1]
+                xpath_matches = [xpath_matches[0]]
             else:
                 xpath_matches = match_siblings(xpath_matches, src_xml, self.xpath_sibling_match_depth)
 
@@ -130,12 +164,16 @@ class XPathMatchStep(MatchStep):
                         lm.xml = xm
                 else:
                     try:
-                        lm.text = lxml.html.tostring(xm, encoding="unicode").strip()
+                        # etree.tostring avoids the lxml.html wrapper overhead and
+                        # with_tail=False saves us stripping the trailing text
+                        lm.text = lxml.etree.tostring(
+                            xm, encoding="unicode", method="html", with_tail=False
+                        )
                         if self.store_xml:
                             lm.xml = xm
                     except (lxml.etree.LxmlError, UnicodeEncodeError):
                         raise ScrMatchError(
-                            f"xpath match encoding in  {self.get_configuring_argument(['xpath'])} failed"
+                            f"xpath match encoding in  {self.get_configuring_argument(['arg_val'])} failed"
                         )
                 res.append(lm)
         return res